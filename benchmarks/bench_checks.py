@@ -0,0 +1,85 @@
+"""
+Micro-benchmark das checagens de permissão (user-033).
+
+  python -m benchmarks.bench_checks [N] [ROLES]
+
+Compara a varredura linear de antes (member.roles inteiro por role-id, a cada chamada)
+com a PermissionPolicy compilada (uma passada nos cargos contra um frozenset).
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+from types import SimpleNamespace
+
+from utils import checks
+from utils import guild_config as gc
+
+GUILD = 1468750429012754464
+
+
+# --- checks.py de antes da policy ---
+def old_has_role(member, role_id: int) -> bool:
+    return any(r.id == role_id for r in member.roles)
+
+
+def old_can_open_transactions(member) -> bool:
+    if member.guild_permissions.administrator:
+        return True
+    cfg = gc.guild_config(member.guild.id)
+    if cfg.captain_role_id and old_has_role(member, cfg.captain_role_id):
+        return True
+    return old_has_role(member, cfg.vice_captain_role_id)
+
+
+def old_can_post_results(member) -> bool:
+    if member.guild_permissions.administrator:
+        return True
+    cfg = gc.guild_config(member.guild.id)
+    return any(r.id in (cfg.referee_role_id, cfg.media_role_id) for r in member.roles)
+
+
+def _member(role_ids: list[int]) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=1,
+        guild=SimpleNamespace(id=GUILD),
+        roles=[SimpleNamespace(id=r) for r in role_ids],
+        guild_permissions=SimpleNamespace(administrator=False),
+    )
+
+
+def _time(fn, n: int) -> float:
+    """µs por chamada (melhor de 5)."""
+    return min(timeit.repeat(fn, number=n, repeat=5)) / n * 1e6
+
+
+def main(argv: list[str]) -> int:
+    n = int(argv[0]) if argv else 20000
+    n_roles = int(argv[1]) if len(argv) > 1 else 30
+
+    gc._cache[GUILD] = cfg = gc.GuildConfig(**gc._defaults(GUILD))
+    # pior caso da varredura: o cargo que libera é o último (ou nenhum)
+    filler = list(range(1000, 1000 + n_roles - 1))
+    members = {
+        "captain": _member(filler + [cfg.captain_role_id]),
+        "sem cargo": _member(filler + [1]),
+    }
+
+    pairs = (
+        ("open", old_can_open_transactions, checks.can_open_transactions),
+        ("results", old_can_post_results, checks.can_post_results),
+    )
+    for m in members.values():
+        for _, old, new in pairs:
+            assert old(m) == new(m), "decisões divergem"
+
+    print(f"{n_roles} cargos por membro")
+    print(f"{'':22}{'linear':>10}{'policy':>10}  (µs/chamada)")
+    for who, m in members.items():
+        for action, old, new in pairs:
+            print(f"{action + ' / ' + who:22}{_time(lambda: old(m), n):>10.2f}{_time(lambda: new(m), n):>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
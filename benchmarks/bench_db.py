@@ -0,0 +1,130 @@
+"""
+Throughput do banco por backend (user-045).
+
+  python -m benchmarks.bench_db [N] [DB_URL ...]
+
+Sem URL roda num SQLite temporário. Cada URL precisa ser um banco VAZIO (o schema é
+criado e apagado no fim), ex: postgresql+psycopg://postgres@localhost/league_bench
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from db import init_db
+from db.backend import engine_options, install_sqlite_pragmas, upsert_stmt
+from db.models import Player, Team, TransactionRequest
+from db.session import Base
+from utils.data_io import _executemany_chunks
+from utils.team_history import history_page, record_results
+
+GUILD = 1468750429012754464
+TEAMS = 20
+
+
+def _rate(n: int, fn) -> float:
+    t = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - t)
+
+
+def bench(url: str, n: int) -> dict[str, float]:
+    eng = create_engine(url, **engine_options(url))
+    install_sqlite_pragmas(eng)
+    if inspect(eng).get_table_names():
+        raise RuntimeError(f"{url}: banco não está vazio.")
+    init_db(eng)
+    Session = sessionmaker(bind=eng, autoflush=False, future=True)
+    out: dict[str, float] = {}
+    try:
+        with Session() as s:
+            s.add_all(Team(guild_id=GUILD, name=f"Team {i}", role_id=GUILD + i) for i in range(TEAMS))
+            s.commit()
+
+            stmt = upsert_stmt(s, Player, [Player.guild_id, Player.user_id], ["username", "team_role"])
+            rows = [dict(guild_id=GUILD, user_id=GUILD + i, username=f"player{i}", team_role=None) for i in range(n)]
+
+            def upsert():
+                _executemany_chunks(s, stmt, rows)
+                s.commit()
+
+            out["upsert novo (rows/s)"] = _rate(n, upsert)
+            for r in rows:
+                r["team_role"] = "Player"
+            out["upsert existente (rows/s)"] = _rate(n, upsert)
+
+            matches = [
+                (f"SA-{i:06d}", f"Team {i % TEAMS}", f"Team {(i + 1) % TEAMS}", 3, i % 4)
+                for i in range(n)
+            ]
+
+            def results():
+                for i in range(0, n, 100):
+                    record_results(s, GUILD, matches[i:i + 100])
+                    s.commit()
+
+            out["resultados (matches/s)"] = _rate(n, results)
+
+            team_id = s.query(Team.id).filter(Team.name == "Team 0").scalar()
+
+            def history():
+                cursor, pages = None, 0
+                while True:
+                    _, cursor = history_page(s, team_id, cursor)
+                    pages += 1
+                    if cursor is None:
+                        return pages
+
+            pages = history()
+            out["histórico (páginas/s)"] = _rate(pages, history)
+
+        def commits():
+            # um commit por transaction, como o /tr_add
+            for i in range(n // 10):
+                with Session() as s:
+                    s.add(TransactionRequest(
+                        guild_id=GUILD, requested_by=GUILD, target_user_id=GUILD + i,
+                        target_username=f"player{i}", action="ADD",
+                    ))
+                    s.commit()
+
+        out["commits (tx/s)"] = _rate(n // 10, commits)
+    finally:
+        Base.metadata.drop_all(bind=eng)
+        if eng.dialect.name == "sqlite":
+            with eng.begin() as conn:
+                conn.execute(text("DROP TABLE IF EXISTS player_names_fts"))
+        eng.dispose()
+    return out
+
+
+def _backend(url: str) -> str:
+    return url.split(":", 1)[0].split("+", 1)[0]
+
+
+def main(argv: list[str]) -> int:
+    n = int(argv[0]) if argv else 5000
+    urls = argv[1:] or [f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}"]
+
+    results = {}
+    for url in urls:
+        try:
+            results[url] = bench(url, n)
+        except RuntimeError as e:
+            print(f"FALHOU {e}")
+            return 1
+
+    names = list(next(iter(results.values())))
+    print(f"{'':28}" + "".join(f"{_backend(u):>14}" for u in results))
+    for name in names:
+        print(f"{name:28}" + "".join(f"{r[name]:>14.0f}" for r in results.values()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
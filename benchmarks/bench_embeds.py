@@ -0,0 +1,88 @@
+"""
+Micro-benchmark dos embeds de transaction (user-042).
+
+  python -m benchmarks.bench_embeds [N]
+
+Compara o layout antigo (add_field um por um, montado na mão a cada embed) com o
+EmbedTemplate, e o link-only view criado a cada aprovação com o cacheado.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import timeit
+import tracemalloc
+
+import discord
+
+from cogs.transactions import PENDING_COLOR, TxReviewView, _common_embed_layout
+
+ARGS = dict(
+    color=PENDING_COLOR,
+    title="Transaction Approved",
+    requested_by="captain_one",
+    body="<@123> → **Team A** as **Player**",
+    actor_label="Approved by",
+    actor_member=None,
+    reason=None,
+    thumb_url="https://tr.rbxcdn.com/headshot.png",
+)
+
+
+def old_layout() -> discord.Embed:
+    # _common_embed_layout de antes do template
+    emb = discord.Embed(color=ARGS["color"])
+    emb.title = ARGS["title"]
+    emb.description = ARGS["body"]
+    emb.add_field(name="Requested by", value=ARGS["requested_by"], inline=False)
+    emb.add_field(name=ARGS["actor_label"], value="—", inline=False)
+    emb.add_field(name="Reason", value=ARGS["reason"] or "—", inline=False)
+    emb.set_thumbnail(url=ARGS["thumb_url"])
+    emb.set_footer(text="CVR Services")
+    return emb
+
+
+def template_layout() -> discord.Embed:
+    return _common_embed_layout(**ARGS)
+
+
+def _bytes_per_call(fn, n: int = 1000) -> float:
+    keep = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(n):
+        keep.append(fn())
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(s.size_diff for s in after.compare_to(before, "filename")) / n
+
+
+def _time(fn, n: int) -> float:
+    """µs por chamada (melhor de 5)."""
+    return min(timeit.repeat(fn, number=n, repeat=5)) / n * 1e6
+
+
+async def _views(n: int) -> tuple[float, float]:
+    def fresh():
+        v = discord.ui.View(timeout=None)
+        v.add_item(discord.ui.Button(label="Roblox Profile", url="https://www.roblox.com/users/1/profile"))
+        return v
+
+    return _time(fresh, n), _time(lambda: TxReviewView.profile_only(1), n)
+
+
+def main(argv: list[str]) -> int:
+    n = int(argv[0]) if argv else 20000
+    assert old_layout().to_dict() == template_layout().to_dict(), "layouts divergem"
+
+    print(f"{'':24}{'µs/embed':>10}{'bytes/embed':>13}")
+    for name, fn in (("add_field (antigo)", old_layout), ("EmbedTemplate", template_layout)):
+        print(f"{name:24}{_time(fn, n):>10.2f}{_bytes_per_call(fn):>13.0f}")
+
+    fresh_us, cached_us = asyncio.run(_views(n // 10))
+    print(f"\nview só com link: novo {fresh_us:.2f} µs • cacheado {cached_us:.2f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
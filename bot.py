@@ -1,43 +1,152 @@
+import time
+
+STARTED_AT = time.perf_counter()
+
+import asyncio
+import logging
+
 import discord
 from discord.ext import commands
 
 from config import CFG, must_token
-from db import init_db
+
+log = logging.getLogger(__name__)
 
 INTENTS = discord.Intents.default()
 INTENTS.members = True
 
-bot = commands.Bot(command_prefix="!", intents=INTENTS)
+# várias ligas no mesmo processo: AutoShardedBot divide os guilds entre shards
+BotClass = commands.AutoShardedBot if CFG.SHARDED else commands.Bot
+
+# sem chunking: nada de baixar todos os membros no startup; utils.members busca sob demanda
+MEMBER_OPTIONS = {} if CFG.MEMBER_CHUNKING else {
+    "chunk_guilds_at_startup": False,
+    "member_cache_flags": discord.MemberCacheFlags.none(),
+}
 
 COGS = (
     "cogs.transactions",
     "cogs.roster",
     "cogs.matches",
+    "cogs.admin",
 )
 
+def _rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss vem em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class StartupTimer:
+    """Tempo de cada fase do startup (segundos desde a marca anterior)."""
+
+    def __init__(self, started_at: float):
+        self.phases: dict[str, float] = {}
+        self._last = started_at
+
+    def mark(self, phase: str) -> None:
+        if phase in self.phases:  # reconnect: on_connect/on_ready disparam de novo
+            return
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    def summary(self) -> str:
+        return " • ".join(f"{name} {secs:.2f}s" for name, secs in self.phases.items())
+
+TIMER = StartupTimer(STARTED_AT)
+TIMER.mark("imports")
+
+def _warm_up_sync() -> None:
+    """Índices do autocomplete (diretório de times, matches pendentes) + config das ligas."""
+    from db.session import get_session
+    from utils.guild_config import preload_guild_configs
+    from utils.search_index import hydrate_indexes
+
+    session = get_session()
+    try:
+        hydrate_indexes(session)
+    finally:
+        session.close()
+    preload_guild_configs()
+
+class LeagueBot(BotClass):
+    async def setup_hook(self):
+        # roda uma vez, depois do login e antes de conectar no gateway (on_ready repete a cada reconnect)
+        TIMER.mark("login")
+        from db import init_db
+        from utils.audit import audit
+
+        init_db()
+        TIMER.mark("db init")
+
+        audit.start()
+        for ext in COGS:
+            await self.load_extension(ext)
+        TIMER.mark("cogs")
+
+        if CFG.READY_FAST:
+            # conecta já; o que não é preciso pra responder a primeira interação vai pro background
+            self._warm_up_task = asyncio.create_task(self._warm_up())
+        else:
+            _warm_up_sync()
+            TIMER.mark("warm-up")
+            await self._sync_commands()
+            TIMER.mark("command sync")
+
+    async def _warm_up(self):
+        t0 = time.perf_counter()
+        try:
+            # hydrate_indexes troca os índices de uma vez: seguro numa thread
+            await asyncio.to_thread(_warm_up_sync)
+            t1 = time.perf_counter()
+            await self._sync_commands()
+            log.info("Warm-up em background: índices/config %.2fs • command sync %.2fs", t1 - t0, time.perf_counter() - t1)
+        except Exception:
+            log.exception("Warm-up falhou")
+
+    async def _sync_commands(self):
+        # sincroniza slash commands no servidor (mais rápido)
+        if CFG.GUILD_ID:
+            guild = discord.Object(id=CFG.GUILD_ID)
+            self.tree.copy_global_to(guild=guild)
+            synced = await self.tree.sync(guild=guild)
+            print(f"✅ Slash commands sincronizados no guild: {len(synced)}")
+        else:
+            synced = await self.tree.sync()
+            print(f"✅ Slash commands sincronizados global: {len(synced)}")
+
+    async def close(self):
+        from utils.audit import audit
+
+        # grava os eventos de audit que ainda estão no buffer
+        await audit.stop()
+        await super().close()
+
+bot = LeagueBot(command_prefix="!", intents=INTENTS, **MEMBER_OPTIONS)
+
 @bot.event
-async def on_ready():
-    init_db()
-
-    # carrega cogs
-    for ext in COGS:
-        if ext not in bot.extensions:
-            await bot.load_extension(ext)
-
-    # sincroniza slash commands no servidor (mais rápido)
-    if CFG.GUILD_ID:
-        guild = discord.Object(id=CFG.GUILD_ID)
-        bot.tree.copy_global_to(guild=guild)
-        synced = await bot.tree.sync(guild=guild)
-        print(f"✅ Slash commands sincronizados no guild: {len(synced)}")
-    else:
-        synced = await bot.tree.sync()
-        print(f"✅ Slash commands sincronizados global: {len(synced)}")
+async def on_connect():
+    TIMER.mark("gateway")
 
+@bot.event
+async def on_ready():
+    # com chunking ligado o discord.py só dispara on_ready depois de baixar os membros
+    TIMER.mark("member chunk" if CFG.MEMBER_CHUNKING else "ready")
     print(f"🤖 Logado como {bot.user}")
 
+    rss = _rss_mb()
+    print(
+        f"⏱️ Pronto em {time.perf_counter() - STARTED_AT:.1f}s ({TIMER.summary()})"
+        f" • chunking {'on' if CFG.MEMBER_CHUNKING else 'off'}"
+        f" • ready-fast {'on' if CFG.READY_FAST else 'off'}"
+        + (f" • RSS máx {rss:.0f} MB" if rss is not None else "")
+    )
+
 def main():
     bot.run(must_token())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+from config import CFG
+from db.session import engine, get_session
+from utils import backup, rate_limit
+from utils.archive import archive_season, incremental_vacuum
+from utils.cache import roster_pages
+from utils.data_io import EXPORT_MODELS, IMPORTERS, export_table
+from utils.embeds import e_err, e_ok, e_info
+from utils.guild_config import guild_config, reset_guild_config_cache, update_guild_settings
+from utils.roster_caps import recount_teams
+from utils.search_index import hydrate_indexes
+
+def _is_admin(interaction: discord.Interaction) -> bool:
+    return isinstance(interaction.user, discord.Member) and interaction.user.guild_permissions.administrator
+
+async def _is_operator(interaction: discord.Interaction) -> bool:
+    """Backup é do processo todo (todas as ligas): dono do bot ou admin do servidor operador."""
+    if await interaction.client.is_owner(interaction.user):
+        return True
+    return bool(CFG.OPERATOR_GUILD_ID) and interaction.guild_id == CFG.OPERATOR_GUILD_ID and _is_admin(interaction)
+
+log = logging.getLogger(__name__)
+
+def _run_export(kind: str, guild_id: int, fmt: str):
+    session = get_session()
+    try:
+        return export_table(session, kind, guild_id, fmt)
+    finally:
+        session.close()
+
+def _run_import(kind: str, guild_id: int, data: bytes, dry_run: bool):
+    session = get_session()
+    try:
+        return IMPORTERS[kind](session, guild_id, data, dry_run)
+    finally:
+        session.close()
+
+def _run_rollover(guild_id: int, season: str):
+    session = get_session()
+    try:
+        counts = archive_season(session, guild_id, season, CFG.ARCHIVE_BATCH)
+    finally:
+        session.close()
+    return counts, incremental_vacuum(engine)
+
+def _run_recount(guild_id: int) -> int:
+    session = get_session()
+    try:
+        return recount_teams(session, guild_id)
+    finally:
+        session.close()
+
+def _refresh_caches():
+    """Depois de import: índices do autocomplete e rosters cacheados ficam velhos."""
+    session = get_session()
+    try:
+        hydrate_indexes(session)
+    finally:
+        session.close()
+    roster_pages.clear()
+
+def _fmt_role(role_id: int) -> str:
+    return f"<@&{role_id}>" if role_id else "—"
+
+def _fmt_channel(channel_id: int) -> str:
+    return f"<#{channel_id}>" if channel_id else "—"
+
+def _fmt_cap(cap: int) -> str:
+    return str(cap) if cap else "sem limite"
+
+async def snapshot_autocomplete(interaction: discord.Interaction, current: str):
+    if not await _is_operator(interaction):
+        return []
+    names = [p.name for p in backup.list_snapshots()]
+    return [app_commands.Choice(name=n, value=n) for n in names if current.lower() in n.lower()][:25]
+
+class AdminCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        if backup.sqlite_path() and CFG.BACKUP_INTERVAL_HOURS > 0:
+            self.scheduled_backup.change_interval(hours=CFG.BACKUP_INTERVAL_HOURS)
+            self.scheduled_backup.start()
+
+    async def cog_unload(self):
+        self.scheduled_backup.cancel()
+
+    # ---- BACKUP
+    @tasks.loop(hours=24)
+    async def scheduled_backup(self):
+        try:
+            path = await asyncio.to_thread(backup.create_snapshot)
+            log.info("Backup criado: %s", path.name)
+        except Exception:
+            log.exception("Backup agendado falhou")
+
+    @scheduled_backup.before_loop
+    async def _before_scheduled_backup(self):
+        await self.bot.wait_until_ready()
+        # não gera snapshot a cada restart: o primeiro sai depois de um intervalo
+        await asyncio.sleep(CFG.BACKUP_INTERVAL_HOURS * 3600)
+
+    @app_commands.command(name="backup_now", description="Gera um snapshot do banco agora (operador).")
+    async def backup_now(self, interaction: discord.Interaction):
+        if not await _is_operator(interaction):
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só o operador do bot."), ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            path = await asyncio.to_thread(backup.create_snapshot)
+        except (RuntimeError, OSError) as e:
+            await interaction.followup.send(embed=e_err("Backup", str(e)), ephemeral=True)
+            return
+        size_kb = path.stat().st_size / 1024
+        await interaction.followup.send(embed=e_ok("Backup", f"`{path.name}` ({size_kb:.0f} KB)"), ephemeral=True)
+
+    @app_commands.command(name="backup_list", description="Lista os snapshots do banco (operador).")
+    async def backup_list(self, interaction: discord.Interaction):
+        if not await _is_operator(interaction):
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só o operador do bot."), ephemeral=True)
+            return
+
+        snaps = backup.list_snapshots()
+        if not snaps:
+            await interaction.response.send_message(embed=e_info("Backup", "Nenhum snapshot ainda."), ephemeral=True)
+            return
+        lines = [f"`{p.name}` • {p.stat().st_size / 1024:.0f} KB" for p in snaps]
+        await interaction.response.send_message(embed=e_info(f"Snapshots ({len(snaps)})", "\n".join(lines)), ephemeral=True)
+
+    @app_commands.command(name="backup_verify", description="Verifica a integridade de um snapshot (operador).")
+    @app_commands.autocomplete(name=snapshot_autocomplete)
+    async def backup_verify(self, interaction: discord.Interaction, name: str):
+        if not await _is_operator(interaction):
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só o operador do bot."), ephemeral=True)
+            return
+
+        path = backup.resolve_snapshot(name)
+        if not path:
+            await interaction.response.send_message(embed=e_err("Backup", "Snapshot não encontrado."), ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        ok, detail = await asyncio.to_thread(backup.verify_snapshot, path)
+        await interaction.followup.send(embed=(e_ok if ok else e_err)(f"Verify • {path.name}", detail), ephemeral=True)
+
+    @app_commands.command(name="backup_restore", description="Restaura o banco (todas as ligas) a partir de um snapshot (operador).")
+    @app_commands.describe(name="Snapshot", confirm="Confirma que quer sobrescrever o banco atual")
+    @app_commands.autocomplete(name=snapshot_autocomplete)
+    async def backup_restore(self, interaction: discord.Interaction, name: str, confirm: bool = False):
+        if not await _is_operator(interaction):
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só o operador do bot."), ephemeral=True)
+            return
+
+        path = backup.resolve_snapshot(name)
+        if not path:
+            await interaction.response.send_message(embed=e_err("Backup", "Snapshot não encontrado."), ephemeral=True)
+            return
+        if not confirm:
+            await interaction.response.send_message(
+                embed=e_err("Restore", f"Isso sobrescreve o banco atual com `{path.name}`. Rode de novo com `confirm: True`."),
+                ephemeral=True,
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            # snapshot de segurança do estado atual antes de sobrescrever (sem rotação)
+            safety = await asyncio.to_thread(backup.create_snapshot, None, False)
+            detail = await asyncio.to_thread(backup.restore_snapshot, path)
+        except (RuntimeError, OSError) as e:
+            await interaction.followup.send(embed=e_err("Restore", str(e)), ephemeral=True)
+            return
+
+        engine.dispose()
+        _refresh_caches()
+        reset_guild_config_cache()
+        matches = self.bot.get_cog("MatchesCog")
+        if matches:
+            matches._rebuild_schedule()
+        await interaction.followup.send(
+            embed=e_ok("Restore", f"Banco restaurado de `{path.name}` ({detail}).\nEstado anterior salvo em `{safety.name}`."),
+            ephemeral=True,
+        )
+
+    @app_commands.command(name="league_config", description="Configura roles/canais da liga neste servidor (admin).")
+    @app_commands.describe(
+        captain="Cargo de Captain",
+        vice_captain="Cargo de Vice Captain",
+        court_captain="Cargo de Court Captain",
+        player="Cargo de Player",
+        referee="Cargo de Referee",
+        media="Cargo de Media",
+        transaction_team="Cargo que aprova/nega transactions (padrão: Captain/Vice)",
+        transactions_channel="Canal de transactions",
+        matches_channel="Canal de lembretes de match",
+        max_players="Máximo de jogadores por time",
+        max_vice_captains="Máximo de Vice Captains por time",
+        max_court_captains="Máximo de Court Captains por time",
+    )
+    async def league_config(
+        self,
+        interaction: discord.Interaction,
+        captain: discord.Role | None = None,
+        vice_captain: discord.Role | None = None,
+        court_captain: discord.Role | None = None,
+        player: discord.Role | None = None,
+        referee: discord.Role | None = None,
+        media: discord.Role | None = None,
+        transaction_team: discord.Role | None = None,
+        transactions_channel: discord.TextChannel | None = None,
+        matches_channel: discord.TextChannel | None = None,
+        max_players: app_commands.Range[int, 1, 99] | None = None,
+        max_vice_captains: app_commands.Range[int, 1, 99] | None = None,
+        max_court_captains: app_commands.Range[int, 1, 99] | None = None,
+    ):
+        if not _is_admin(interaction) or not interaction.guild_id:
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
+            return
+
+        cfg = update_guild_settings(
+            interaction.guild_id,
+            captain_role_id=captain.id if captain else None,
+            vice_captain_role_id=vice_captain.id if vice_captain else None,
+            court_captain_role_id=court_captain.id if court_captain else None,
+            player_role_id=player.id if player else None,
+            referee_role_id=referee.id if referee else None,
+            media_role_id=media.id if media else None,
+            review_role_id=transaction_team.id if transaction_team else None,
+            transactions_channel_id=transactions_channel.id if transactions_channel else None,
+            matches_channel_id=matches_channel.id if matches_channel else None,
+            roster_max_players=max_players,
+            roster_max_vice_captains=max_vice_captains,
+            roster_max_court_captains=max_court_captains,
+        )
+        await interaction.response.send_message(embed=self._config_embed(cfg), ephemeral=True)
+
+    @app_commands.command(name="league_config_show", description="Mostra a config da liga neste servidor.")
+    async def league_config_show(self, interaction: discord.Interaction):
+        if not _is_admin(interaction):
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
+            return
+        await interaction.response.send_message(embed=self._config_embed(guild_config(interaction.guild_id)), ephemeral=True)
+
+    # ---- EXPORT / IMPORT
+    @app_commands.command(name="export", description="Exporta dados da liga em CSV/JSON (admin).")
+    @app_commands.describe(kind="O que exportar", fmt="Formato do arquivo")
+    @app_commands.choices(
+        kind=[app_commands.Choice(name=k, value=k) for k in EXPORT_MODELS],
+        fmt=[app_commands.Choice(name="CSV", value="csv"), app_commands.Choice(name="JSON", value="json")],
+    )
+    async def export(self, interaction: discord.Interaction, kind: app_commands.Choice[str], fmt: app_commands.Choice[str]):
+        if not _is_admin(interaction) or not interaction.guild_id:
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        # cursor em blocos numa thread: o bot continua respondendo enquanto gera o arquivo
+        fp, count = await asyncio.to_thread(_run_export, kind.value, interaction.guild_id, fmt.value)
+        try:
+            filename = f"{kind.value}-{datetime.utcnow().strftime('%Y%m%d-%H%M')}.{fmt.value}"
+            await interaction.followup.send(
+                embed=e_info("Export", f"**{count}** rows de `{kind.value}`."),
+                file=discord.File(fp, filename=filename),
+                ephemeral=True,
+            )
+        finally:
+            fp.close()
+
+    @app_commands.command(name="import_data", description="Importa times/jogadores de um CSV (admin). Dry-run por padrão.")
+    @app_commands.describe(
+        kind="teams: name,role_id,captain_user_id • players: user_id,username,team",
+        file="Arquivo CSV com header",
+        dry_run="Só valida e mostra o relatório, sem gravar",
+    )
+    @app_commands.choices(kind=[app_commands.Choice(name=k, value=k) for k in IMPORTERS])
+    async def import_data(self, interaction: discord.Interaction, kind: app_commands.Choice[str], file: discord.Attachment, dry_run: bool = True):
+        if not _is_admin(interaction) or not interaction.guild_id:
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        data = await file.read()
+        report = await asyncio.to_thread(_run_import, kind.value, interaction.guild_id, data, dry_run)
+        if not dry_run and (report.inserted or report.updated):
+            _refresh_caches()
+        emb = (e_err if report.errors and not (report.inserted or report.updated) else e_ok)("Import", report.summary()[:4000])
+        await interaction.followup.send(embed=emb, ephemeral=True)
+
+    @app_commands.command(name="roster_recount", description="Recalcula os contadores de roster dos times a partir dos jogadores (admin).")
+    async def roster_recount(self, interaction: discord.Interaction):
+        if not _is_admin(interaction) or not interaction.guild_id:
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        changed = await asyncio.to_thread(_run_recount, interaction.guild_id)
+        await interaction.followup.send(embed=e_ok("Roster", f"Contadores recalculados • **{changed}** time(s) corrigido(s)."), ephemeral=True)
+
+    @app_commands.command(name="rate_stats", description="Buckets do rate limit e tentativas barradas desde o start (admin).")
+    async def rate_stats(self, interaction: discord.Interaction):
+        if not _is_admin(interaction):
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
+            return
+
+        stats = rate_limit.stats()
+        buckets = " • ".join(f"{scope} {n}" for scope, n in stats["buckets"].items())
+        rejected = sorted(stats["rejected"].items(), key=lambda kv: -kv[1])
+        lines = [f"`{command}` ({scope}): **{n}**" for (scope, command), n in rejected[:25]]
+        desc = f"Buckets: {buckets}\n\n" + ("\n".join(lines) if lines else "Nenhuma tentativa barrada.")
+        await interaction.response.send_message(embed=e_info("Rate limit", desc), ephemeral=True)
+
+    # ---- SEASON ROLLOVER
+    @app_commands.command(name="season_rollover", description="Arquiva transactions fechadas e matches finalizados da season (admin).")
+    @app_commands.describe(season="Nome da season que está fechando (ex: S1-2026)", confirm="Confirma o arquivamento")
+    async def season_rollover(self, interaction: discord.Interaction, season: str, confirm: bool = False):
+        if not _is_admin(interaction) or not interaction.guild_id:
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
+            return
+        season = season.strip()[:32]
+        if not season or not confirm:
+            await interaction.response.send_message(
+                embed=e_info("Season rollover", "Move transactions APPROVED/REJECTED/EXPIRED e matches DONE (com resultados) pro arquivo. Rode com `confirm: True`."),
+                ephemeral=True,
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        counts, vacuum = await asyncio.to_thread(_run_rollover, interaction.guild_id, season)
+        lines = [f"- **{k}**: {v}" for k, v in counts.items()]
+        lines.append(f"\nVacuum: {vacuum}")
+        await interaction.followup.send(embed=e_ok(f"Season {season} arquivada", "\n".join(lines)), ephemeral=True)
+
+    @staticmethod
+    def _config_embed(cfg) -> discord.Embed:
+        emb = e_ok("Config da liga", f"Guild `{cfg.guild_id}`")
+        emb.add_field(name="Captain", value=_fmt_role(cfg.captain_role_id), inline=True)
+        emb.add_field(name="Vice Captain", value=_fmt_role(cfg.vice_captain_role_id), inline=True)
+        emb.add_field(name="Court Captain", value=_fmt_role(cfg.court_captain_role_id), inline=True)
+        emb.add_field(name="Player", value=_fmt_role(cfg.player_role_id), inline=True)
+        emb.add_field(name="Referee", value=_fmt_role(cfg.referee_role_id), inline=True)
+        emb.add_field(name="Media", value=_fmt_role(cfg.media_role_id), inline=True)
+        emb.add_field(name="Transaction Team", value=_fmt_role(cfg.review_role_id) if cfg.review_role_id else "Captain/Vice", inline=True)
+        emb.add_field(name="Transactions", value=_fmt_channel(cfg.transactions_channel_id), inline=True)
+        emb.add_field(name="Matches", value=_fmt_channel(cfg.matches_channel_id), inline=True)
+        emb.add_field(
+            name="Limites do roster",
+            value=(
+                f"Jogadores: {_fmt_cap(cfg.roster_max_players)} • Vice: {_fmt_cap(cfg.roster_max_vice_captains)}"
+                f" • Court: {_fmt_cap(cfg.roster_max_court_captains)}"
+            ),
+            inline=False,
+        )
+        return emb
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(AdminCog(bot))
@@ -3,29 +3,206 @@ from __future__ import annotations
 import discord
 from discord import app_commands
 from discord.ext import commands
-from datetime import datetime
+from datetime import datetime, timedelta
+import csv
 import random
+import re
 
+from sqlalchemy import tuple_
+
+from config import CFG
 from db.session import get_session
-from db.models import MatchSchedule, MatchResult
+from db.models import MatchSchedule, MatchResult, Team
 from utils.checks import can_post_results
-from utils.embeds import e_err, e_ok, e_info
+from utils.audit import audit
+from utils.autocomplete import team_autocomplete
+from utils.embeds import e_err, e_ok, e_info, fail_after_defer, utc_stamp
+from utils.guild_config import guild_config
+from utils.pagination import KeysetPager
+from utils.scheduler import Scheduler
+from utils.search_index import pending_matches
+from utils.team_history import h2h_record, history_page, outcome, record_result, record_results, resolve_team_ids
+
+MATCH_PAGE_SIZE = 15
+RESULT_BULK_MAX = 50
+_MVP_RE = re.compile(r"^(?:<@!?)?(\d{15,21})>?$")
+
+WHEN_FORMATS = (
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%y %H:%M",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M",
+)
 
 def gen_match_id() -> str:
     # simples e único (pode trocar por algo mais “bonito”)
     return f"SA-{datetime.utcnow().strftime('%Y%m%d')}-{random.randint(1000,9999)}"
 
+def parse_when(text: str) -> datetime | None:
+    """Converte o horário digitado (fuso da liga) para UTC naive. None se não entender."""
+    text = " ".join((text or "").split())
+    for fmt in WHEN_FORMATS:
+        try:
+            local = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        return local - timedelta(hours=CFG.MATCH_UTC_OFFSET_HOURS)
+    return None
+
+async def pending_match_autocomplete(interaction: discord.Interaction, current: str):
+    ids = pending_matches(interaction.guild_id or 0).search(current)
+    return [app_commands.Choice(name=mid, value=mid) for mid in ids]
+
+def parse_result_rows(
+    text: str,
+) -> tuple[list[tuple[str, str, int, int, int | None, int | None]], list[str], dict[str, list[str]]]:
+    """
+    Linhas `match_id,a,b,mvp_a,mvp_b` (CSV, ou texto com uma linha por `;`).
+    Retorna ([(label, match_id, a, b, mvp_a, mvp_b)], erros, avisos por label).
+    MVP: menção ou ID, opcional; MVP inválido só vira aviso (a linha continua valendo).
+    """
+    lines = [ln for ln in re.split(r"[;\n]", text or "") if ln.strip()]
+    rows, errors = [], []
+    warnings: dict[str, list[str]] = {}
+    for n, cells in enumerate(csv.reader(lines), start=1):
+        cells = [c.strip() for c in cells] + ["", "", "", "", ""]
+        label = f"linha {n}"
+        if cells[0].lower() == "match_id":  # header do CSV
+            continue
+        match_id, a_txt, b_txt, mvp_a_txt, mvp_b_txt = cells[:5]
+        if not match_id:
+            errors.append(f"{label}: match_id vazio.")
+            continue
+        if not (a_txt.isdigit() and b_txt.isdigit()):
+            errors.append(f"{label}: placar inválido (`{a_txt or '—'}` x `{b_txt or '—'}`).")
+            continue
+        mvps = []
+        for txt in (mvp_a_txt, mvp_b_txt):
+            m = _MVP_RE.match(txt)
+            mvps.append(int(m.group(1)) if m else None)
+            if txt and not m:
+                warnings.setdefault(label, []).append(f"{label}: MVP `{txt}` ignorado (use menção ou ID).")
+        rows.append((label, match_id, int(a_txt), int(b_txt), mvps[0], mvps[1]))
+    return rows, errors, warnings
+
+def discord_ts(dt: datetime, style: str = "F") -> str:
+    # dt é UTC naive
+    epoch = int((dt - datetime(1970, 1, 1)).total_seconds())
+    return f"<t:{epoch}:{style}>"
+
 class MatchesCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.scheduler = Scheduler()
+
+    async def cog_load(self):
+        self._rebuild_schedule()
+        # job vencido com o bot desligado roda logo: espera o gateway, senão get_channel() ainda é None
+        self.scheduler.start(self.bot.wait_until_ready)
+
+    async def cog_unload(self):
+        self.scheduler.stop()
+
+    # ----------------------------
+    # Agenda (lembrete + auto-close)
+    # ----------------------------
+    def _rebuild_schedule(self):
+        """Recarrega todos os matches OPEN com horário do DB (startup)."""
+        self.scheduler.clear()
+        session = get_session()
+        try:
+            rows = (
+                session.query(MatchSchedule.match_id, MatchSchedule.scheduled_at)
+                .filter(MatchSchedule.status == "OPEN", MatchSchedule.scheduled_at.isnot(None))
+                .all()
+            )
+        finally:
+            session.close()
+
+        for match_id, scheduled_at in rows:
+            self._schedule_match(match_id, scheduled_at)
+
+    def _schedule_match(self, match_id: str, scheduled_at: datetime):
+        now = datetime.utcnow()
+        remind_at = scheduled_at - timedelta(minutes=CFG.MATCH_REMINDER_MINUTES)
+        # lembrete que já passou (ex: bot reiniciou) não é reenviado
+        if remind_at > now:
+            self.scheduler.schedule(remind_at, ("remind", match_id), lambda: self._send_reminder(match_id))
+
+        close_at = scheduled_at + timedelta(hours=CFG.MATCH_AUTO_CLOSE_HOURS)
+        self.scheduler.schedule(close_at, ("close", match_id), lambda: self._auto_close(match_id))
+
+    def _unschedule_match(self, match_id: str):
+        self.scheduler.cancel(("remind", match_id))
+        self.scheduler.cancel(("close", match_id))
+
+    def _matches_channel(self, guild_id: int):
+        channel_id = guild_config(guild_id).matches_channel_id
+        return self.bot.get_channel(channel_id) if channel_id else None
+
+    async def _send_reminder(self, match_id: str):
+        session = get_session()
+        try:
+            ms = session.query(MatchSchedule).filter_by(match_id=match_id).first()
+            if not ms or ms.status != "OPEN" or not ms.scheduled_at:
+                return
+
+            mentions = []
+            for name in (ms.team_a, ms.team_b):
+                t = session.query(Team).filter(Team.guild_id == ms.guild_id, Team.name.ilike(name)).first()
+                mentions.append(f"<@&{t.role_id}>" if t else f"**{name}**")
+        finally:
+            session.close()
+
+        channel = self._matches_channel(ms.guild_id)
+        if not channel:
+            return
+
+        emb = discord.Embed(title="Lembrete de match", color=0x3498db)
+        emb.add_field(name="Match ID", value=f"`{ms.match_id}`", inline=False)
+        emb.add_field(name="Confronto", value=f"**{ms.team_a}** vs **{ms.team_b}** (Bo{ms.best_of})", inline=False)
+        emb.add_field(name="Quando", value=f"{discord_ts(ms.scheduled_at)} ({discord_ts(ms.scheduled_at, 'R')})", inline=False)
+        await channel.send(
+            content=" ".join(mentions),
+            embed=emb,
+            allowed_mentions=discord.AllowedMentions(roles=True),
+        )
+
+    async def _auto_close(self, match_id: str):
+        session = get_session()
+        try:
+            ms = session.query(MatchSchedule).filter_by(match_id=match_id).first()
+            if not ms or ms.status != "OPEN":
+                return
+            ms.status = "CLOSED"
+            session.commit()
+            guild_id = ms.guild_id
+            audit.emit(guild_id, None, "match.closed", f"match:{match_id}", auto=True)
+        finally:
+            session.close()
+
+        channel = self._matches_channel(guild_id)
+        if channel:
+            await channel.send(embed=e_info("Match fechado", f"`{match_id}` passou da janela sem resultado e foi fechado automaticamente."))
 
     @app_commands.command(name="match_create", description="Cria um match na agenda (gera match_id).")
-    @app_commands.describe(team_a="Time A", team_b="Time B", best_of="Bo (3 ou 5)", when="Data/hora (texto) opcional")
+    @app_commands.describe(team_a="Time A", team_b="Time B", best_of="Bo (3 ou 5)", when="Data/hora opcional (DD/MM/AAAA HH:MM)")
+    @app_commands.autocomplete(team_a=team_autocomplete, team_b=team_autocomplete)
     async def match_create(self, interaction: discord.Interaction, team_a: str, team_b: str, best_of: int = 5, when: str | None = None):
         if not isinstance(interaction.user, discord.Member) or not interaction.user.guild_permissions.administrator:
             await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
             return
 
+        scheduled_at = None
+        if when:
+            scheduled_at = parse_when(when)
+            if not scheduled_at:
+                await interaction.response.send_message(
+                    embed=e_err("Data inválida", "Use o formato `DD/MM/AAAA HH:MM` (ex: `21/03/2026 19:30`)."),
+                    ephemeral=True,
+                )
+                return
+
         session = get_session()
         try:
             mid = gen_match_id()
@@ -35,22 +212,28 @@ class MatchesCog(commands.Cog):
                 team_a=team_a,
                 team_b=team_b,
                 best_of=best_of,
-                scheduled_at=None,
+                scheduled_at=scheduled_at,
                 status="OPEN",
             )
             session.add(ms)
             session.commit()
+            pending_matches(ms.guild_id).add(mid)
+            audit.emit(ms.guild_id, interaction.user.id, "match.created", f"match:{mid}", team_a=team_a, team_b=team_b, best_of=best_of, scheduled_at=scheduled_at)
+
+            if scheduled_at:
+                self._schedule_match(mid, scheduled_at)
 
             emb = discord.Embed(title="Match criado", color=0x2ecc71)
             emb.add_field(name="Match ID", value=f"`{mid}`", inline=False)
             emb.add_field(name="Confronto", value=f"**{team_a}** vs **{team_b}** (Bo{best_of})", inline=False)
-            emb.add_field(name="Quando", value=when or "—", inline=False)
+            emb.add_field(name="Quando", value=discord_ts(scheduled_at) if scheduled_at else "—", inline=False)
             await interaction.response.send_message(embed=emb, ephemeral=False)
         finally:
             session.close()
 
     @app_commands.command(name="match_close", description="Fecha um match (por match_id).")
     @app_commands.describe(match_id="ID do match")
+    @app_commands.autocomplete(match_id=pending_match_autocomplete)
     async def match_close(self, interaction: discord.Interaction, match_id: str):
         if not isinstance(interaction.user, discord.Member) or not interaction.user.guild_permissions.administrator:
             await interaction.response.send_message(embed=e_err("Sem permissão", "Só admin."), ephemeral=True)
@@ -64,12 +247,15 @@ class MatchesCog(commands.Cog):
                 return
             ms.status = "CLOSED"
             session.commit()
+            self._unschedule_match(match_id)
+            audit.emit(ms.guild_id, interaction.user.id, "match.closed", f"match:{match_id}")
             await interaction.response.send_message(embed=e_ok("OK", f"Match `{match_id}` foi fechado."), ephemeral=True)
         finally:
             session.close()
 
     @app_commands.command(name="result_post", description="Posta resultado do match (Referee/Media/Admin).")
     @app_commands.describe(match_id="ID do match", a="Placar Time A", b="Placar Time B", mvp_a="MVP do time A (opcional)", mvp_b="MVP do time B (opcional)")
+    @app_commands.autocomplete(match_id=pending_match_autocomplete)
     async def result_post(
         self,
         interaction: discord.Interaction,
@@ -106,9 +292,14 @@ class MatchesCog(commands.Cog):
                 posted_by=interaction.user.id
             )
             session.add(r)
+            # índice de histórico/h2h no mesmo commit
+            record_result(session, ms.guild_id, match_id, ms.team_a, ms.team_b, a, b)
 
             ms.status = "DONE"
             session.commit()
+            self._unschedule_match(match_id)
+            pending_matches(ms.guild_id).remove(match_id)
+            audit.emit(ms.guild_id, interaction.user.id, "match.result_posted", f"match:{match_id}", a=a, b=b, mvp_a=r.mvp_a, mvp_b=r.mvp_b)
 
             emb = discord.Embed(title="Resultado", color=0x2ecc71)
             emb.add_field(name="Match ID", value=f"`{match_id}`", inline=False)
@@ -116,26 +307,193 @@ class MatchesCog(commands.Cog):
             emb.add_field(name="Placar", value=f"**{a}** x **{b}**", inline=False)
             emb.add_field(name="MVP A", value=(mvp_a.mention if mvp_a else "—"), inline=True)
             emb.add_field(name="MVP B", value=(mvp_b.mention if mvp_b else "—"), inline=True)
-            emb.set_footer(text=f"Postado por {interaction.user} • {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
+            emb.set_footer(text=f"Postado por {interaction.user} • {utc_stamp()}")
             await interaction.response.send_message(embed=emb, ephemeral=False)
         finally:
             session.close()
 
-    @app_commands.command(name="match_list", description="Lista matches abertos/fechados.")
-    async def match_list(self, interaction: discord.Interaction):
+    @app_commands.command(name="result_bulk", description="Posta vários resultados de uma vez (Referee/Media/Admin).")
+    @app_commands.describe(
+        results="match_id,a,b,mvp_a,mvp_b separados por ; (ex: SA-1,3,1; SA-2,0,3)",
+        file="CSV com colunas match_id,a,b,mvp_a,mvp_b",
+    )
+    async def result_bulk(self, interaction: discord.Interaction, results: str | None = None, file: discord.Attachment | None = None):
+        member = interaction.user
+        if not isinstance(member, discord.Member):
+            await interaction.response.send_message(embed=e_err("Erro", "Use no servidor."), ephemeral=True)
+            return
+
+        if not can_post_results(member):
+            await interaction.response.send_message(embed=e_err("Sem permissão", "Apenas Admin/Referee/Media."), ephemeral=True)
+            return
+
+        # download do anexo + lote no DB podem passar dos 3s da interação
+        await interaction.response.defer(thinking=True)
+        text = results or ""
+        if file:
+            text += "\n" + (await file.read()).decode("utf-8-sig", errors="replace")
+        rows, errors, warnings = parse_result_rows(text)
+        if not rows:
+            await fail_after_defer(interaction, embed=e_err("Nada pra postar", "\n".join(errors)[:4000] or "Informe `results` ou um CSV."))
+            return
+        if len(rows) > RESULT_BULK_MAX:
+            await fail_after_defer(interaction, embed=e_err("Lote grande demais", f"Máximo de {RESULT_BULK_MAX} resultados por vez."))
+            return
+
+        guild_id = interaction.guild_id or 0
         session = get_session()
         try:
-            rows = session.query(MatchSchedule).filter_by(guild_id=interaction.guild_id).order_by(MatchSchedule.created_at.desc()).limit(10).all()
-            if not rows:
-                await interaction.response.send_message(embed=e_info("Vazio", "Nenhum match criado ainda."), ephemeral=True)
+            # valida o lote inteiro com uma query
+            schedule = {
+                ms.match_id: ms
+                for ms in session.query(MatchSchedule).filter(
+                    MatchSchedule.guild_id == guild_id,
+                    MatchSchedule.match_id.in_({r[1] for r in rows}),
+                ).all()
+            }
+            valid, seen, notes = [], set(), []
+            for label, match_id, a, b, mvp_a, mvp_b in rows:
+                ms = schedule.get(match_id)
+                if not ms:
+                    errors.append(f"{label}: match `{match_id}` não existe.")
+                elif ms.status == "DONE":
+                    errors.append(f"{label}: `{match_id}` já tem resultado (use /result_post pra corrigir).")
+                elif match_id in seen:
+                    errors.append(f"{label}: `{match_id}` repetido no lote.")
+                else:
+                    valid.append((match_id, a, b, mvp_a, mvp_b))
+                    notes += warnings.get(label, [])
+                seen.add(match_id)
+
+            if not valid:
+                await fail_after_defer(interaction, embed=e_err("Nenhum resultado postado", "\n".join(errors)[:4000]))
                 return
 
+            # nomes antes do commit (depois dele as rows expiram e cada acesso viraria um SELECT)
+            pairs = {match_id: (schedule[match_id].team_a, schedule[match_id].team_b) for match_id, *_ in valid}
+
+            # tudo numa transação: resultados + status + índice de histórico
+            now = datetime.utcnow()
+            session.add_all(
+                MatchResult(
+                    guild_id=guild_id, match_id=match_id, team_a_score=a, team_b_score=b,
+                    mvp_a=mvp_a, mvp_b=mvp_b, posted_by=member.id, created_at=now,
+                )
+                for match_id, a, b, mvp_a, mvp_b in valid
+            )
+            session.query(MatchSchedule).filter(
+                MatchSchedule.guild_id == guild_id,
+                MatchSchedule.match_id.in_([v[0] for v in valid]),
+            ).update({MatchSchedule.status: "DONE"}, synchronize_session=False)
+            record_results(
+                session, guild_id,
+                [(match_id, *pairs[match_id], a, b) for match_id, a, b, _, _ in valid],
+                played_at=now,
+            )
+            session.commit()
+
+            lines = []
+            for match_id, a, b, mvp_a, mvp_b in valid:
+                self._unschedule_match(match_id)
+                pending_matches(guild_id).remove(match_id)
+                audit.emit(guild_id, member.id, "match.result_posted", f"match:{match_id}", a=a, b=b, mvp_a=mvp_a, mvp_b=mvp_b, bulk=True)
+                team_a, team_b = pairs[match_id]
+                lines.append(f"`{match_id}` • **{team_a}** {a} x {b} **{team_b}**")
+        finally:
+            session.close()
+
+        emb = discord.Embed(title=f"Resultados ({len(valid)})", description="\n".join(lines)[:4000], color=0x2ecc71)
+        emb.set_footer(text=f"Postado por {member} • {utc_stamp()}")
+        await interaction.followup.send(embed=emb)
+        if notes:
+            await interaction.followup.send(embed=e_info("Postados com aviso", "\n".join(notes)[:4000]), ephemeral=True)
+        if errors:
+            await interaction.followup.send(embed=e_err("Linhas ignoradas", "\n".join(errors)[:4000]), ephemeral=True)
+
+    @app_commands.command(name="match_list", description="Lista matches abertos/fechados.")
+    async def match_list(self, interaction: discord.Interaction):
+        guild_id = interaction.guild_id
+
+        def fetch(cursor):
+            session = get_session()
+            try:
+                q = session.query(MatchSchedule).filter_by(guild_id=guild_id)
+                if cursor:
+                    q = q.filter(tuple_(MatchSchedule.created_at, MatchSchedule.id) < tuple_(*cursor))
+                rows = (
+                    q.order_by(MatchSchedule.created_at.desc(), MatchSchedule.id.desc())
+                    .limit(MATCH_PAGE_SIZE + 1)
+                    .all()
+                )
+            finally:
+                session.close()
+
+            next_cursor = None
+            if len(rows) > MATCH_PAGE_SIZE:
+                rows = rows[:MATCH_PAGE_SIZE]
+                next_cursor = (rows[-1].created_at, rows[-1].id)
+
             lines = []
             for m in rows:
-                lines.append(f"`{m.match_id}` • **{m.team_a}** vs **{m.team_b}** • {m.status}")
-            await interaction.response.send_message("\n".join(lines), ephemeral=True)
+                when = f" • {discord_ts(m.scheduled_at, 'f')}" if m.scheduled_at else ""
+                lines.append(f"`{m.match_id}` • **{m.team_a}** vs **{m.team_b}** • {m.status}{when}")
+            return e_info("Matches", "\n".join(lines)), next_cursor
+
+        await KeysetPager.send(interaction, fetch, ephemeral=True, empty=e_info("Vazio", "Nenhum match criado ainda."))
+
+    # ----------------------------
+    # Histórico / head-to-head (team_results)
+    # ----------------------------
+    @app_commands.command(name="team_history", description="Resultados de um time (mais recentes primeiro).")
+    @app_commands.describe(team="Time", opponent="Só contra esse adversário (opcional)")
+    @app_commands.autocomplete(team=team_autocomplete, opponent=team_autocomplete)
+    async def team_history(self, interaction: discord.Interaction, team: str, opponent: str | None = None):
+        await self._send_history(interaction, team, opponent)
+
+    @app_commands.command(name="h2h", description="Confronto direto entre dois times.")
+    @app_commands.describe(team_a="Time A", team_b="Time B")
+    @app_commands.autocomplete(team_a=team_autocomplete, team_b=team_autocomplete)
+    async def h2h(self, interaction: discord.Interaction, team_a: str, team_b: str):
+        await self._send_history(interaction, team_a, team_b)
+
+    async def _send_history(self, interaction: discord.Interaction, team: str, opponent: str | None):
+        guild_id = interaction.guild_id or 0
+        session = get_session()
+        try:
+            ids = resolve_team_ids(session, guild_id, team, *([opponent] if opponent else []))
+            missing = [n for n in (team, opponent) if n and n not in ids]
+            if missing:
+                await interaction.response.send_message(embed=e_err("Não achei", f"Time **{missing[0]}** não cadastrado."), ephemeral=True)
+                return
+            team_id = ids[team]
+            opponent_id = ids[opponent] if opponent else None
+            record = h2h_record(session, team_id, opponent_id) if opponent_id else None
+            names = dict(session.query(Team.id, Team.name).filter(Team.guild_id == guild_id).all())
         finally:
             session.close()
 
+        title = f"{names[team_id]} vs {names[opponent_id]}" if opponent_id else f"Histórico • {names[team_id]}"
+        header = ""
+        if record:
+            header = (
+                f"**{record.wins}V {record.losses}D**" + (f" {record.draws}E" if record.draws else "")
+                + f" em {record.played} jogos • pontos {record.points_for} x {record.points_against}\n\n"
+            )
+
+        def fetch(cursor):
+            session = get_session()
+            try:
+                rows, next_cursor = history_page(session, team_id, cursor, opponent_id)
+            finally:
+                session.close()
+            lines = [
+                f"`{r.played_at:%Y-%m-%d}` **{outcome(r)}** {r.points_for} x {r.points_against}"
+                f" vs **{names.get(r.opponent_id, 'Unknown')}** • `{r.match_id}`"
+                for r in rows
+            ]
+            return e_info(title, header + "\n".join(lines) if lines else ""), next_cursor
+
+        await KeysetPager.send(interaction, fetch, ephemeral=True, empty=e_info(title, "Nenhum resultado ainda."))
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(MatchesCog(bot))
\ No newline at end of file
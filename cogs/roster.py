@@ -1,10 +1,63 @@
+import re
+
 import discord
 from discord import app_commands
 from discord.ext import commands
+from sqlalchemy import tuple_
 
 from db.session import get_session
 from db.models import Team, Player
+from utils.autocomplete import team_autocomplete
+from utils.cache import roster_pages
 from utils.embeds import e_err, e_info
+from utils.pagination import KeysetPager
+from utils.player_search import search_players
+
+ROSTER_PAGE_SIZE = 20
+_USER_ID_RE = re.compile(r"^(?:<@!?)?(\d{15,21})>?$")
+
+def _roster_page_text(guild_id: int, team_id: int, cursor: tuple[str, int] | None) -> tuple[str, tuple[str, int] | None]:
+    """Uma página do roster (keyset em username, id), cacheada até o time mudar."""
+    pages = roster_pages.get((guild_id, team_id))
+    if pages is None:
+        pages = {}
+        roster_pages.set((guild_id, team_id), pages)
+    if cursor in pages:
+        return pages[cursor]
+
+    session = get_session()
+    try:
+        q = session.query(Player.id, Player.user_id, Player.username).filter_by(guild_id=guild_id, team_id=team_id)
+        if cursor:
+            q = q.filter(tuple_(Player.username, Player.id) > tuple_(*cursor))
+        rows = q.order_by(Player.username.asc(), Player.id.asc()).limit(ROSTER_PAGE_SIZE + 1).all()
+    finally:
+        session.close()
+
+    next_cursor = None
+    if len(rows) > ROSTER_PAGE_SIZE:
+        rows = rows[:ROSTER_PAGE_SIZE]
+        next_cursor = (rows[-1].username, rows[-1].id)
+
+    text = "\n".join(f"- <@{r.user_id}> ({r.username})" for r in rows)
+    pages[cursor] = (text, next_cursor)
+    return text, next_cursor
+
+async def player_autocomplete(interaction: discord.Interaction, current: str):
+    session = get_session()
+    try:
+        hits = search_players(session, interaction.guild_id or 0, current)
+    finally:
+        session.close()
+    return [app_commands.Choice(name=f"{h.name} ({h.user_id})"[:100], value=str(h.user_id)) for h in hits]
+
+def _resolve_user_id(session, guild_id: int, text: str) -> int | None:
+    """Valor do autocomplete/menção/ID direto; senão o melhor match da busca."""
+    m = _USER_ID_RE.match(text.strip())
+    if m:
+        return int(m.group(1))
+    hits = search_players(session, guild_id, text, limit=1)
+    return hits[0].user_id if hits else None
 
 class RosterCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -12,30 +65,36 @@ class RosterCog(commands.Cog):
 
     @app_commands.command(name="roster", description="Mostra o roster de um time.")
     @app_commands.describe(team_name="Nome do time")
+    @app_commands.autocomplete(team_name=team_autocomplete)
     async def roster(self, interaction: discord.Interaction, team_name: str):
         session = get_session()
         try:
-            team = session.query(Team).filter(Team.name.ilike(team_name)).first()
+            team = session.query(Team).filter(Team.guild_id == interaction.guild_id, Team.name.ilike(team_name)).first()
             if not team:
                 await interaction.response.send_message(embed=e_err("Não achei", f"Time **{team_name}** não cadastrado."), ephemeral=True)
                 return
 
-            players = session.query(Player).filter_by(guild_id=interaction.guild_id, team_id=team.id).order_by(Player.username.asc()).all()
-            if not players:
-                await interaction.response.send_message(embed=e_info("Roster", f"**{team.name}** ainda não tem jogadores."), ephemeral=True)
-                return
-
-            lines = [f"- <@{p.user_id}> ({p.username})" for p in players]
-            emb = discord.Embed(title=f"Roster • {team.name}", description="\n".join(lines), color=0x2ecc71)
-            await interaction.response.send_message(embed=emb, ephemeral=False)
+            team_id, name = team.id, team.name
         finally:
             session.close()
 
+        guild_id = interaction.guild_id or 0
+
+        def fetch(cursor):
+            text, next_cursor = _roster_page_text(guild_id, team_id, cursor)
+            return discord.Embed(title=f"Roster • {name}", description=text, color=0x2ecc71), next_cursor
+
+        await KeysetPager.send(interaction, fetch, empty=e_info("Roster", f"**{name}** ainda não tem jogadores."))
+
     @app_commands.command(name="player", description="Mostra info do jogador na liga.")
-    async def player(self, interaction: discord.Interaction, user: discord.Member):
+    @app_commands.describe(user="Nome, @menção ou ID (funciona pra quem já saiu do servidor)")
+    @app_commands.autocomplete(user=player_autocomplete)
+    async def player(self, interaction: discord.Interaction, user: str):
+        guild_id = interaction.guild_id or 0
         session = get_session()
         try:
-            p = session.query(Player).filter_by(guild_id=interaction.guild_id, user_id=user.id).first()
+            user_id = _resolve_user_id(session, guild_id, user)
+            p = session.query(Player).filter_by(guild_id=guild_id, user_id=user_id).first() if user_id else None
             if not p:
                 await interaction.response.send_message(embed=e_err("Não registrado", "Esse jogador não está no banco ainda."), ephemeral=True)
                 return
@@ -47,11 +106,39 @@ class RosterCog(commands.Cog):
                     team_name = t.name
 
             emb = discord.Embed(title="Player", color=0x3498db)
-            emb.add_field(name="Jogador", value=f"{user.mention} ({p.username})", inline=False)
+            emb.add_field(name="Jogador", value=f"<@{p.user_id}> ({p.username})", inline=False)
             emb.add_field(name="Time", value=team_name, inline=False)
             await interaction.response.send_message(embed=emb, ephemeral=True)
         finally:
             session.close()
 
+    @app_commands.command(name="player_search", description="Busca jogadores por nome (Discord/Roblox), inclusive quem saiu.")
+    @app_commands.describe(query="Parte do nome")
+    async def player_search(self, interaction: discord.Interaction, query: str):
+        guild_id = interaction.guild_id or 0
+        session = get_session()
+        try:
+            hits = search_players(session, guild_id, query)
+            if not hits:
+                await interaction.response.send_message(embed=e_err("Não achei", f"Nenhum jogador com **{query}**."), ephemeral=True)
+                return
+
+            team_ids = dict(
+                session.query(Player.user_id, Player.team_id)
+                .filter(Player.guild_id == guild_id, Player.user_id.in_([h.user_id for h in hits]))
+                .all()
+            )
+            wanted = {t for t in team_ids.values() if t}
+            names = dict(session.query(Team.id, Team.name).filter(Team.id.in_(wanted)).all()) if wanted else {}
+        finally:
+            session.close()
+
+        lines = []
+        for h in hits:
+            team = names.get(team_ids.get(h.user_id), "Free Agent") if h.user_id in team_ids else "sem registro"
+            aka = f" • aka {', '.join(h.aliases[:3])}" if h.aliases else ""
+            lines.append(f"<@{h.user_id}> **{h.name}** • {team}{aka}")
+        await interaction.response.send_message(embed=e_info(f"Busca • {query}", "\n".join(lines)[:4000]), ephemeral=True)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(RosterCog(bot))
\ No newline at end of file
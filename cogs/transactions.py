@@ -2,27 +2,44 @@ from __future__ import annotations
 
 import discord
 from discord import app_commands
-from discord.ext import commands
-from datetime import datetime
+from discord.ext import commands, tasks
+from sqlalchemy import func
+from datetime import datetime, timedelta
+import csv
+import io
+import logging
+import re
 
 from db.session import get_session
-from db.models import TransactionRequest, Team, Player
+from db.models import TransactionRequest, TransactionRequestArchive, Team, Player
 from utils.checks import can_open_transactions, can_review_transactions
-from utils.roblox import username_to_user_id, roblox_headshot_url
+from utils.roblox import username_to_user_id, roblox_headshot_url, usernames_to_user_ids
+from utils.audit import audit
+from utils.cache import LRUCache, invalidate_roster
+from utils.embeds import EmbedTemplate, fail_after_defer
+from utils.edit_queue import MessageEditQueue
+from utils.guild_config import guild_config
+from utils.members import forget, get_members, remember
+from utils.rate_limit import throttle
+from utils.roster_caps import cap_violation, move_player, roster_delta
+from utils.search_index import team_names, team_roles
 from config import CFG
 
+log = logging.getLogger(__name__)
+
 
 # ----------------------------
 # ROLE OPTIONS
 # ----------------------------
 ROLE_KEYS = ("Vice Captain", "Court Captain", "Player")
 
-def role_key_to_id(role_key: str) -> int:
+def role_key_to_id(role_key: str, guild_id: int) -> int:
+    cfg = guild_config(guild_id)
     if role_key == "Vice Captain":
-        return CFG.ROLE_VICE_CAPTAIN_ID
+        return cfg.vice_captain_role_id
     if role_key == "Court Captain":
-        return CFG.ROLE_COURT_CAPTAIN_ID
-    return CFG.ROLE_PLAYER_ID
+        return cfg.court_captain_role_id
+    return cfg.player_role_id
 
 
 # ----------------------------
@@ -31,6 +48,29 @@ def role_key_to_id(role_key: str) -> int:
 PENDING_COLOR  = 0x0F1115
 ACCEPTED_COLOR = 0x00FF3A
 DENIED_COLOR   = 0xFF1A1A
+EXPIRED_COLOR  = 0x95A5A6
+
+
+# ----------------------------
+# EXPIRAÇÃO (TTL por ação)
+# ----------------------------
+TX_ACTIONS = ("ADD", "REMOVE", "TRANSFER")
+
+def team_role_after(action: str, requested_role: str | None) -> str | None:
+    """Role no time depois de aprovada (ADD usa a pedida, TRANSFER entra como Player)."""
+    if action == "ADD":
+        return requested_role or "Player"
+    if action == "TRANSFER":
+        return "Player"
+    return None
+
+
+def tx_ttl_hours(action: str) -> int:
+    if action == "ADD":
+        return CFG.TX_TTL_ADD_HOURS
+    if action == "REMOVE":
+        return CFG.TX_TTL_REMOVE_HOURS
+    return CFG.TX_TTL_TRANSFER_HOURS
 
 
 async def get_roblox_assets(member: discord.Member) -> tuple[int | None, str | None]:
@@ -42,6 +82,11 @@ async def get_roblox_assets(member: discord.Member) -> tuple[int | None, str | N
     return rbx_id, headshot
 
 
+# Views só com o botão de link (resultado final): sem callback, o discord.py não as registra
+# no ViewStore, então a mesma instância serve pra qualquer mensagem.
+_profile_views = LRUCache(maxsize=1024)
+
+
 def profile_link_button(roblox_user_id: int | None) -> discord.ui.Button:
     if not roblox_user_id:
         return discord.ui.Button(label="Profile", style=discord.ButtonStyle.secondary, disabled=True)
@@ -74,9 +119,9 @@ async def _ensure_player_row(session, guild_id: int, member: discord.Member) ->
     return row
 
 
-def _infer_team_from_roles(session, member: discord.Member) -> Team | None:
+def _infer_team_from_roles(session, guild_id: int, member: discord.Member) -> Team | None:
     """Fallback: tenta achar time pelo cargo do time (teams.role_id)."""
-    teams = session.query(Team).all()
+    teams = session.query(Team).filter_by(guild_id=guild_id).all()
     member_role_ids = {r.id for r in member.roles}
     for t in teams:
         if t.role_id in member_role_ids:
@@ -94,52 +139,56 @@ async def _get_requester_team(session, guild_id: int, requester: discord.Member)
         return session.query(Team).filter_by(id=requester_row.team_id).first()
 
     # fallback por roles
-    inferred = _infer_team_from_roles(session, requester)
+    inferred = _infer_team_from_roles(session, guild_id, requester)
     if inferred:
         requester_row = await _ensure_player_row(session, guild_id, requester)
-        requester_row.team_id = inferred.id
+        move_player(session, requester_row, inferred.id, requester_row.team_role)
         session.commit()
+        invalidate_roster(guild_id, inferred.id)
         return inferred
 
     return None
 
 
+async def _tx_members(interaction: discord.Interaction, tx: TransactionRequest) -> tuple[discord.Member | None, discord.Member | None]:
+    """(target, requester) da transaction numa busca só (cache -> query_members)."""
+    guild = interaction.guild
+    if not guild:
+        return None, None
+    if isinstance(interaction.user, discord.Member):
+        remember(interaction.user)
+    found = await get_members(guild, (tx.target_user_id, tx.requested_by))
+    return found.get(tx.target_user_id), found.get(tx.requested_by)
+
+
+# Layout fixo das transactions: Requested by / <actor_label> / Reason (sempre os 3, pra manter tamanho parecido)
+_TX_TEMPLATES = {
+    label: EmbedTemplate(color=PENDING_COLOR, fields=("Requested by", label, "Reason"), footer="CVR Services")
+    for label in ("Status", "Approved by", "Denied by")
+}
+
+
 def _common_embed_layout(
     *,
     color: int,
     title: str,
-    requested_by: discord.Member,
+    requested_by: discord.abc.User | str,
     body: str,
     actor_label: str,
     actor_member: discord.Member | None,
     reason: str | None,
     thumb_url: str | None,
 ) -> discord.Embed:
-    emb = discord.Embed(color=color)
-    emb.title = title
-    emb.description = body
-
-    # Requested by: pequeno, sem ping
-    emb.add_field(name="Requested by", value=f"{requested_by.name}", inline=False)
-
-    # Approved/Denied: COM ping + username
-    if actor_member:
-        emb.add_field(
-            name=actor_label,
-            value=f"{actor_member.mention} ({actor_member.name})",
-            inline=False
+    template = _TX_TEMPLATES.get(actor_label)
+    if template is None:
+        template = _TX_TEMPLATES[actor_label] = EmbedTemplate(
+            color=PENDING_COLOR, fields=("Requested by", actor_label, "Reason"), footer="CVR Services"
         )
-    else:
-        emb.add_field(name=actor_label, value="—", inline=False)
 
-    # Reason SEMPRE (pra manter tamanho parecido)
-    emb.add_field(name="Reason", value=(reason or "—"), inline=False)
-
-    if thumb_url:
-        emb.set_thumbnail(url=thumb_url)
-
-    emb.set_footer(text="CVR Services")
-    return emb
+    # Requested by: pequeno, sem ping • Approved/Denied: COM ping + username
+    requested_name = requested_by if isinstance(requested_by, str) else requested_by.name
+    actor = f"{actor_member.mention} ({actor_member.name})" if actor_member else None
+    return template.render(requested_name, actor, reason, title=title, description=body, color=color, thumbnail=thumb_url)
 
 
 async def build_pending_embed(
@@ -213,6 +262,182 @@ async def build_result_embed(
     return emb, rbx_id
 
 
+def build_expired_embed(tx: TransactionRequest, requested_by: str, to_team_name: str) -> discord.Embed:
+    """Sem lookup no Roblox: o sweeper edita muitas mensagens de uma vez."""
+    target = f"<@{tx.target_user_id}>"
+    if tx.action == "ADD":
+        body = f"{target} → **{to_team_name}** as **{tx.requested_role}**"
+    elif tx.action == "REMOVE":
+        body = f"{target} → **Free Agent**"
+    else:
+        body = f"{target} → **{to_team_name}**"
+
+    return _common_embed_layout(
+        color=EXPIRED_COLOR,
+        title="Expired Transaction",
+        requested_by=requested_by,
+        body=body,
+        actor_label="Status",
+        actor_member=None,
+        reason=tx.reason,
+        thumb_url=None,
+    )
+
+
+def expire_stale_transactions(
+    session, now: datetime, batch_size: int, guild_id: int | None = None,
+) -> tuple[dict[str, int], list[TransactionRequest]]:
+    """
+    Marca como EXPIRED as transactions PENDING que passaram do TTL da ação.
+    Lê pelo índice (status, created_at) e atualiza em lotes de `batch_size`.
+    `guild_id`: só essa liga (/tx_sweep); None = todas (sweeper).
+    Retorna (contagem por ação, rows expiradas que têm mensagem pra editar).
+    """
+    counts: dict[str, int] = {}
+    to_edit: list[TransactionRequest] = []
+
+    for action in TX_ACTIONS:
+        hours = tx_ttl_hours(action)
+        if hours <= 0:
+            continue
+        cutoff = now - timedelta(hours=hours)
+        reason = f"Expired after {hours}h without review."
+
+        while True:
+            q = session.query(TransactionRequest).filter(
+                TransactionRequest.status == "PENDING",
+                TransactionRequest.created_at < cutoff,
+                TransactionRequest.action == action,
+            )
+            if guild_id is not None:
+                q = q.filter(TransactionRequest.guild_id == guild_id)
+            rows = (
+                q.order_by(TransactionRequest.created_at.asc())
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            ids = [r.id for r in rows]
+            # desanexa antes do commit: as rows ficam como snapshot pra editar as mensagens
+            for r in rows:
+                session.expunge(r)
+                r.status = "EXPIRED"
+                r.reason = reason
+
+            session.query(TransactionRequest).filter(
+                TransactionRequest.id.in_(ids),
+                TransactionRequest.status == "PENDING",
+            ).update(
+                {
+                    TransactionRequest.status: "EXPIRED",
+                    TransactionRequest.reason: reason,
+                    TransactionRequest.reviewed_at: now,
+                },
+                synchronize_session=False,
+            )
+            session.commit()
+            for r in rows:
+                audit.emit(r.guild_id, None, "tx.expired", f"tx:{r.id}", action=action, ttl_hours=hours)
+
+            counts[action] = counts.get(action, 0) + len(rows)
+            to_edit.extend(r for r in rows if r.channel_id and r.message_id)
+            if len(rows) < batch_size:
+                break
+
+    return counts, to_edit
+
+
+async def _apply_approval(session, tx: TransactionRequest, guild: discord.Guild | None, target: discord.Member | None, reviewer_id: int) -> str | None:
+    """
+    Aprova a transaction: status, players.team_id (+ contadores do time) e roles no Discord.
+    Retorna o motivo se o roster de destino estiver no limite (nada é gravado).
+    """
+    guild_id = tx.guild_id
+
+    # garante row
+    if guild and target:
+        player_row = await _ensure_player_row(session, guild_id, target)
+    else:
+        player_row = session.query(Player).filter_by(guild_id=guild_id, user_id=tx.target_user_id).first()
+        if not player_row:
+            player_row = Player(guild_id=guild_id, user_id=tx.target_user_id, username=tx.target_username)
+            session.add(player_row)
+            session.flush()
+
+    new_team_id = tx.to_team_id if tx.action in ("ADD", "TRANSFER") else None
+    new_role = team_role_after(tx.action, tx.requested_role)
+
+    # limites do roster: o time pode ter enchido desde o pedido
+    team = session.get(Team, new_team_id) if new_team_id else None
+    if team:
+        err = cap_violation(team, guild_config(guild_id), player_row.team_id, player_row.team_role, new_role)
+        if err:
+            session.rollback()
+            return err
+
+    # status + team_id + contadores no mesmo commit
+    old_team_id = player_row.team_id
+    tx.status = "APPROVED"
+    tx.reviewed_by = reviewer_id
+    tx.reviewed_at = datetime.utcnow()
+    move_player(session, player_row, new_team_id, new_role)
+    session.commit()
+    audit.emit(guild_id, reviewer_id, "tx.approved", f"tx:{tx.id}", action=tx.action)
+    invalidate_roster(guild_id, old_team_id, tx.to_team_id)
+    audit.emit(guild_id, reviewer_id, "player.team_changed", f"user:{tx.target_user_id}", tx_id=tx.id, from_team_id=old_team_id, to_team_id=player_row.team_id)
+
+    # roles no Discord (mantém tua lógica atual de roles, simples)
+    if guild and target:
+        # Descobre role do time
+        team_role_id = None
+        if tx.to_team_id:
+            t = session.query(Team).filter_by(id=tx.to_team_id).first()
+            if t:
+                team_role_id = t.role_id
+
+        added: list[int] = []
+        removed: list[int] = []
+
+        # limpa posição
+        cfg = guild_config(guild_id)
+        for rid in (cfg.vice_captain_role_id, cfg.court_captain_role_id, cfg.player_role_id):
+            r = guild.get_role(rid)
+            if r:
+                await target.remove_roles(r, reason="League transaction cleanup")
+                removed.append(rid)
+
+        if tx.action == "REMOVE":
+            if team_role_id:
+                tr = guild.get_role(team_role_id)
+                if tr:
+                    await target.remove_roles(tr, reason="League remove approved")
+                    removed.append(team_role_id)
+        else:
+            if team_role_id:
+                tr = guild.get_role(team_role_id)
+                if tr:
+                    await target.add_roles(tr, reason="League add/transfer approved")
+                    added.append(team_role_id)
+
+            if tx.action == "ADD" and tx.requested_role:
+                rr = guild.get_role(role_key_to_id(tx.requested_role, guild_id))
+                if rr:
+                    await target.add_roles(rr, reason="League role assigned on approve")
+                    added.append(rr.id)
+
+            if tx.action == "TRANSFER":
+                rr = guild.get_role(cfg.player_role_id)
+                if rr:
+                    await target.add_roles(rr, reason="League transfer default role")
+                    added.append(rr.id)
+
+        forget(guild_id, target.id)
+        audit.emit(guild_id, reviewer_id, "roles.changed", f"user:{target.id}", tx_id=tx.id, added=added, removed=removed)
+    return None
+
+
 # ----------------------------
 # Deny modal (Transaction Team)
 # ----------------------------
@@ -251,10 +476,9 @@ class DenyReasonModal(discord.ui.Modal, title="Deny Transaction"):
             tx.reviewed_by = interaction.user.id
             tx.reviewed_at = datetime.utcnow()
             session.commit()
+            audit.emit(tx.guild_id, interaction.user.id, "tx.denied", f"tx:{tx.id}", reason=tx.reason)
 
-            guild = interaction.guild
-            target = guild.get_member(tx.target_user_id) if guild else None
-            requester = guild.get_member(tx.requested_by) if guild else None
+            target, requester = await _tx_members(interaction, tx)
 
             to_team_name = _team_name(session, tx.to_team_id)
             emb, rbx_id = await build_result_embed(
@@ -287,8 +511,11 @@ class TxReviewView(discord.ui.View):
 
     @staticmethod
     def profile_only(roblox_user_id: int | None) -> discord.ui.View:
-        v = discord.ui.View(timeout=None)
-        v.add_item(profile_link_button(roblox_user_id))
+        v = _profile_views.get(roblox_user_id)
+        if v is None:
+            v = discord.ui.View(timeout=None)
+            v.add_item(profile_link_button(roblox_user_id))
+            _profile_views.set(roblox_user_id, v)
         return v
 
     @discord.ui.button(label="Accept", style=discord.ButtonStyle.success)
@@ -304,6 +531,8 @@ class TxReviewView(discord.ui.View):
         if not isinstance(member, discord.Member):
             await interaction.response.send_message("Use isso no servidor.", ephemeral=True)
             return
+        if await throttle(interaction, "tx_accept"):
+            return
 
         session = get_session()
         try:
@@ -312,9 +541,7 @@ class TxReviewView(discord.ui.View):
                 await interaction.response.send_message("Transaction inválida.", ephemeral=True)
                 return
 
-            guild = interaction.guild
-            target = guild.get_member(tx.target_user_id) if guild else None
-            requester = guild.get_member(tx.requested_by) if guild else None
+            target, requester = await _tx_members(interaction, tx)
             to_team_name = _team_name(session, tx.to_team_id)
 
             # TRANSFER: 2 etapas
@@ -329,6 +556,7 @@ class TxReviewView(discord.ui.View):
                     tx.player_confirmed_by = member.id
                     tx.player_confirmed_at = datetime.utcnow()
                     session.commit()
+                    audit.emit(tx.guild_id, member.id, "tx.player_accepted", f"tx:{tx.id}")
 
                     emb, rbx_id = await build_pending_embed(
                         session,
@@ -364,67 +592,10 @@ class TxReviewView(discord.ui.View):
             session.close()
 
     async def _final_approve(self, interaction, session, tx, requester, target, to_team_name):
-        tx.status = "APPROVED"
-        tx.reviewed_by = interaction.user.id
-        tx.reviewed_at = datetime.utcnow()
-        session.commit()
-
-        # DB Player
-        guild_id = tx.guild_id
-        guild = interaction.guild
-
-        # garante row
-        if guild and target:
-            player_row = await _ensure_player_row(session, guild_id, target)
-        else:
-            player_row = session.query(Player).filter_by(guild_id=guild_id, user_id=tx.target_user_id).first()
-            if not player_row:
-                player_row = Player(guild_id=guild_id, user_id=tx.target_user_id, username=tx.target_username)
-                session.add(player_row)
-                session.flush()
-
-        # atualizar team_id
-        if tx.action in ("ADD", "TRANSFER"):
-            player_row.team_id = tx.to_team_id
-        elif tx.action == "REMOVE":
-            player_row.team_id = None
-        session.commit()
-
-        # roles no Discord (mantém tua lógica atual de roles, simples)
-        if guild and target:
-            # Descobre role do time
-            team_role_id = None
-            if tx.to_team_id:
-                t = session.query(Team).filter_by(id=tx.to_team_id).first()
-                if t:
-                    team_role_id = t.role_id
-
-            # limpa posição
-            for rid in (CFG.ROLE_VICE_CAPTAIN_ID, CFG.ROLE_COURT_CAPTAIN_ID, CFG.ROLE_PLAYER_ID):
-                r = guild.get_role(rid)
-                if r:
-                    await target.remove_roles(r, reason="League transaction cleanup")
-
-            if tx.action == "REMOVE":
-                if team_role_id:
-                    tr = guild.get_role(team_role_id)
-                    if tr:
-                        await target.remove_roles(tr, reason="League remove approved")
-            else:
-                if team_role_id:
-                    tr = guild.get_role(team_role_id)
-                    if tr:
-                        await target.add_roles(tr, reason="League add/transfer approved")
-
-                if tx.action == "ADD" and tx.requested_role:
-                    rr = guild.get_role(role_key_to_id(tx.requested_role))
-                    if rr:
-                        await target.add_roles(rr, reason="League role assigned on approve")
-
-                if tx.action == "TRANSFER":
-                    rr = guild.get_role(CFG.ROLE_PLAYER_ID)
-                    if rr:
-                        await target.add_roles(rr, reason="League transfer default role")
+        err = await _apply_approval(session, tx, interaction.guild, target, interaction.user.id)
+        if err:
+            await interaction.response.send_message(f"Não dá pra aprovar: {err}", ephemeral=True)
+            return
 
         emb, rbx_id = await build_result_embed(
             session,
@@ -442,6 +613,8 @@ class TxReviewView(discord.ui.View):
         if not isinstance(member, discord.Member):
             await interaction.response.send_message("Use isso no servidor.", ephemeral=True)
             return
+        if await throttle(interaction, "tx_deny"):
+            return
 
         session = get_session()
         try:
@@ -457,10 +630,9 @@ class TxReviewView(discord.ui.View):
                 tx.reviewed_by = member.id
                 tx.reviewed_at = datetime.utcnow()
                 session.commit()
+                audit.emit(tx.guild_id, member.id, "tx.player_denied", f"tx:{tx.id}")
 
-                guild = interaction.guild
-                target = guild.get_member(tx.target_user_id) if guild else None
-                requester = guild.get_member(tx.requested_by) if guild else None
+                target, requester = await _tx_members(interaction, tx)
                 to_team_name = _team_name(session, tx.to_team_id)
 
                 emb, rbx_id = await build_result_embed(
@@ -486,12 +658,404 @@ class TxReviewView(discord.ui.View):
             session.close()
 
 
+# ----------------------------
+# BULK (vários jogadores num comando só)
+# ----------------------------
+BULK_PAGE_SIZE = 10
+BULK_MAX_ROWS = 100
+_USER_ID_RE = re.compile(r"<@!?(\d+)>|\b(\d{15,21})\b")
+
+
+def parse_user_ids(text: str) -> list[int]:
+    """Menções/IDs em texto livre, sem repetir e na ordem em que aparecem."""
+    out: list[int] = []
+    for m in _USER_ID_RE.finditer(text or ""):
+        uid = int(m.group(1) or m.group(2))
+        if uid not in out:
+            out.append(uid)
+    return out
+
+
+def _validate_bulk(session, guild_id: int, entries: list[tuple[str, int, str, int | None, str | None]]) -> tuple[list[tuple], list[str]]:
+    """
+    entries: (label, user_id, action, team_id, role).
+    Valida tudo com uma query por tabela; retorna (válidas, erros).
+    """
+    ids = [e[1] for e in entries]
+    players = {
+        p.user_id: p
+        for p in session.query(Player).filter(Player.guild_id == guild_id, Player.user_id.in_(ids)).all()
+    }
+    pending = {
+        uid for (uid,) in session.query(TransactionRequest.target_user_id).filter(
+            TransactionRequest.guild_id == guild_id,
+            TransactionRequest.status == "PENDING",
+            TransactionRequest.target_user_id.in_(ids),
+        ).all()
+    }
+
+    team_ids = {e[3] for e in entries if e[2] == "ADD" and e[3]}
+    teams = {t.id: t for t in session.query(Team).filter(Team.id.in_(team_ids)).all()} if team_ids else {}
+    cfg = guild_config(guild_id)
+    reserved: dict[int, dict[str, int]] = {}  # vagas já usadas pelas linhas válidas do lote
+
+    valid, errors, seen = [], [], set()
+    for label, uid, action, team_id, role in entries:
+        current_team_id = players[uid].team_id if uid in players else None
+        current_role = players[uid].team_role if uid in players else None
+        cap_err = (
+            cap_violation(teams[team_id], cfg, current_team_id, current_role, role, reserved.get(team_id))
+            if action == "ADD" and team_id in teams else None
+        )
+        if uid in seen:
+            errors.append(f"{label}: <@{uid}> repetido no lote.")
+        elif uid in pending:
+            errors.append(f"{label}: <@{uid}> já tem transaction pendente.")
+        elif action == "ADD" and current_team_id == team_id:
+            errors.append(f"{label}: <@{uid}> já está nesse time.")
+        elif action == "REMOVE" and (current_team_id is None or current_team_id != team_id):
+            errors.append(f"{label}: <@{uid}> não está nesse time.")
+        elif cap_err:
+            errors.append(f"{label}: {cap_err}")
+        else:
+            valid.append((label, uid, action, team_id, role))
+            if action == "ADD":
+                r = reserved.setdefault(team_id, {})
+                for col, n in roster_delta(current_team_id, current_role, team_id, role).get(team_id, {}).items():
+                    r[col] = r.get(col, 0) + n
+        seen.add(uid)
+    return valid, errors
+
+
+def _create_bulk_rows(session, guild_id: int, requester_id: int, valid: list[tuple], usernames: dict[int, str]) -> list[int]:
+    """Cria players faltando + todas as TransactionRequest num commit só."""
+    ids = [v[1] for v in valid]
+    known = {uid for (uid,) in session.query(Player.user_id).filter(Player.guild_id == guild_id, Player.user_id.in_(ids)).all()}
+    session.add_all(
+        Player(guild_id=guild_id, user_id=uid, username=usernames.get(uid, str(uid)))
+        for uid in ids if uid not in known
+    )
+
+    txs = [
+        TransactionRequest(
+            guild_id=guild_id,
+            requested_by=requester_id,
+            target_user_id=uid,
+            target_username=usernames.get(uid, str(uid)),
+            action=action,
+            from_team_id=None,
+            to_team_id=team_id if action == "ADD" else None,
+            requested_role=role,
+            status="PENDING",
+            reason=None,
+            player_confirmed=False,
+        )
+        for _, uid, action, team_id, role in valid
+    ]
+    session.add_all(txs)
+    session.commit()
+    for tx in txs:
+        audit.emit(guild_id, requester_id, "tx.created", f"tx:{tx.id}", action=tx.action, target=tx.target_user_id, to_team_id=tx.to_team_id, bulk=True)
+    return [tx.id for tx in txs]
+
+
+async def _roblox_ids(members: dict[int, discord.Member | None]) -> dict[int, int]:
+    """user_id -> Roblox id pelo display name; uma chamada pro lote inteiro."""
+    display = {uid: m.display_name.strip() for uid, m in members.items() if m}
+    rbx = await usernames_to_user_ids(list(display.values()))
+    return {uid: rbx[name] for uid, name in display.items() if name in rbx}
+
+
+class BulkTxReviewView(discord.ui.View):
+    """Uma mensagem pro lote todo: página com select por linha + aprovar/negar selecionadas + aprovar tudo."""
+
+    def __init__(self, tx_ids: list[int], roblox_ids: dict[int, int], requester_name: str):
+        super().__init__(timeout=None)
+        self.tx_ids = tx_ids
+        self.roblox_ids = roblox_ids
+        self.requester_name = requester_name
+        self.page = 0
+        # user_id -> tx_ids: o select é por cliente, cada reviewer age só no que ele marcou
+        self.selected: dict[int, list[int]] = {}
+
+        self.select = discord.ui.Select(placeholder="Selecionar transactions...", min_values=1)
+        self.select.callback = self._on_select
+        self.add_item(self.select)
+
+        for label, style, handler in (
+            ("Approve selected", discord.ButtonStyle.success, self._approve_selected),
+            ("Deny selected", discord.ButtonStyle.danger, self._deny_selected),
+            ("Approve all", discord.ButtonStyle.primary, self._approve_all),
+            ("◀", discord.ButtonStyle.secondary, self._prev),
+            ("▶", discord.ButtonStyle.secondary, self._next),
+        ):
+            b = discord.ui.Button(label=label, style=style)
+            b.callback = handler
+            self.add_item(b)
+
+    def _page_ids(self) -> list[int]:
+        start = self.page * BULK_PAGE_SIZE
+        return self.tx_ids[start:start + BULK_PAGE_SIZE]
+
+    def render(self, session) -> discord.Embed:
+        """Re-lê o lote do DB e monta embed + opções do select."""
+        rows = session.query(TransactionRequest).filter(TransactionRequest.id.in_(self._page_ids())).order_by(TransactionRequest.id).all()
+        team_ids = {r.to_team_id for r in rows if r.to_team_id}
+        names = dict(session.query(Team.id, Team.name).filter(Team.id.in_(team_ids)).all()) if team_ids else {}
+
+        lines, options = [], []
+        for r in rows:
+            dest = f"**{names.get(r.to_team_id, 'Unknown')}** as **{r.requested_role}**" if r.action == "ADD" else "**Free Agent**"
+            rbx_id = self.roblox_ids.get(r.target_user_id)
+            link = f" • [Profile](https://www.roblox.com/users/{rbx_id}/profile)" if rbx_id else ""
+            lines.append(f"`#{r.id}` <@{r.target_user_id}> → {dest} • {r.status}{link}")
+            if r.status == "PENDING":
+                options.append(discord.SelectOption(label=f"#{r.id} {r.target_username}"[:100], value=str(r.id)))
+
+        self.select.options = options or [discord.SelectOption(label="Nada pendente nesta página", value="0")]
+        self.select.max_values = max(len(options), 1)
+        self.select.disabled = not options
+        # mensagem editada volta o select de todo mundo pro vazio
+        self.selected = {}
+
+        pages = max((len(self.tx_ids) - 1) // BULK_PAGE_SIZE + 1, 1)
+        for item in self.children:
+            if isinstance(item, discord.ui.Button) and item.label == "◀":
+                item.disabled = self.page == 0
+            elif isinstance(item, discord.ui.Button) and item.label == "▶":
+                item.disabled = self.page >= pages - 1
+
+        emb = _common_embed_layout(
+            color=PENDING_COLOR,
+            title=f"Pending Transactions ({len(self.tx_ids)})",
+            requested_by=self.requester_name,
+            body="\n".join(lines),
+            actor_label="Status",
+            actor_member=None,
+            reason=None,
+            thumb_url=None,
+        )
+        emb.set_footer(text=f"CVR Services • Página {self.page + 1}/{pages}")
+        return emb
+
+    async def _refresh(self, interaction: discord.Interaction, deferred: bool = False):
+        session = get_session()
+        try:
+            emb = self.render(session)
+        finally:
+            session.close()
+        if deferred:
+            await interaction.edit_original_response(embed=emb, view=self)
+        else:
+            await interaction.response.edit_message(embed=emb, view=self)
+
+    async def _on_select(self, interaction: discord.Interaction):
+        if not await self._check_reviewer(interaction):
+            return
+        self.selected[interaction.user.id] = [int(v) for v in self.select.values if v != "0"]
+        await interaction.response.defer()
+
+    async def _check_reviewer(self, interaction: discord.Interaction) -> bool:
+        member = interaction.user
+        if not isinstance(member, discord.Member) or not can_review_transactions(member):
+            await interaction.response.send_message("Sem permissão.", ephemeral=True)
+            return False
+        return True
+
+    async def _approve(self, interaction: discord.Interaction, ids: list[int]):
+        if not await self._check_reviewer(interaction):
+            return
+        if await throttle(interaction, "tx_bulk_approve"):
+            return
+        # roles no Discord podem demorar: responde antes
+        await interaction.response.defer()
+
+        guild = interaction.guild
+        session = get_session()
+        try:
+            rows = session.query(TransactionRequest).filter(
+                TransactionRequest.id.in_(ids),
+                TransactionRequest.status == "PENDING",
+            ).all()
+            targets = await get_members(guild, [tx.target_user_id for tx in rows]) if guild else {}
+            blocked = []
+            for tx in rows:
+                err = await _apply_approval(session, tx, guild, targets.get(tx.target_user_id), interaction.user.id)
+                if err:
+                    blocked.append(f"`#{tx.id}` <@{tx.target_user_id}>: {err}")
+        finally:
+            session.close()
+        await self._refresh(interaction, deferred=True)
+        if blocked:
+            await interaction.followup.send("Não aprovadas (limite do roster):\n" + "\n".join(blocked)[:1900], ephemeral=True)
+
+    async def _approve_selected(self, interaction: discord.Interaction):
+        ids = self.selected.get(interaction.user.id)
+        if not ids:
+            await interaction.response.send_message("Seleciona ao menos uma transaction.", ephemeral=True)
+            return
+        await self._approve(interaction, ids)
+
+    async def _approve_all(self, interaction: discord.Interaction):
+        await self._approve(interaction, self.tx_ids)
+
+    async def _deny_selected(self, interaction: discord.Interaction):
+        if not await self._check_reviewer(interaction):
+            return
+        ids = self.selected.get(interaction.user.id)
+        if not ids:
+            await interaction.response.send_message("Seleciona ao menos uma transaction.", ephemeral=True)
+            return
+        if await throttle(interaction, "tx_bulk_deny"):
+            return
+
+        session = get_session()
+        try:
+            denied = [
+                tx_id for (tx_id,) in session.query(TransactionRequest.id).filter(
+                    TransactionRequest.id.in_(ids),
+                    TransactionRequest.status == "PENDING",
+                ).all()
+            ]
+            session.query(TransactionRequest).filter(
+                TransactionRequest.id.in_(denied),
+                TransactionRequest.status == "PENDING",
+            ).update(
+                {
+                    TransactionRequest.status: "REJECTED",
+                    TransactionRequest.reason: "Denied in bulk review.",
+                    TransactionRequest.reviewed_by: interaction.user.id,
+                    TransactionRequest.reviewed_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            session.commit()
+            for tx_id in denied:
+                audit.emit(interaction.guild_id, interaction.user.id, "tx.denied", f"tx:{tx_id}", reason="Denied in bulk review.")
+        finally:
+            session.close()
+        await self._refresh(interaction)
+
+    async def _prev(self, interaction: discord.Interaction):
+        self.page = max(self.page - 1, 0)
+        await self._refresh(interaction)
+
+    async def _next(self, interaction: discord.Interaction):
+        self.page += 1
+        await self._refresh(interaction)
+
+
 # ----------------------------
 # COG
 # ----------------------------
 class TransactionsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.edit_queue = MessageEditQueue(bot, CFG.MESSAGE_EDITS_PER_SECOND)
+
+    async def cog_load(self):
+        self.edit_queue.start()
+        self.expiry_sweeper.change_interval(minutes=CFG.TX_SWEEP_MINUTES)
+        self.expiry_sweeper.start()
+
+    async def cog_unload(self):
+        self.expiry_sweeper.cancel()
+        self.edit_queue.stop()
+
+    # ---- EXPIRAÇÃO
+    async def _sweep_expired(self, guild_id: int | None = None) -> dict[str, int]:
+        session = get_session()
+        try:
+            counts, rows = expire_stale_transactions(session, datetime.utcnow(), CFG.TX_SWEEP_BATCH, guild_id)
+            if not rows:
+                return counts
+
+            team_ids = {r.to_team_id for r in rows if r.to_team_id}
+            names = dict(session.query(Team.id, Team.name).filter(Team.id.in_(team_ids)).all()) if team_ids else {}
+
+            # mensagem com várias transactions = lote (BulkTxReviewView): re-renderiza a lista inteira
+            batches: dict[int, list[int]] = {}
+            batch_targets: dict[int, set[int]] = {}
+            for mid, tid, target in (
+                session.query(TransactionRequest.message_id, TransactionRequest.id, TransactionRequest.target_user_id)
+                .filter(TransactionRequest.message_id.in_({r.message_id for r in rows}))
+                .order_by(TransactionRequest.id)
+            ):
+                batches.setdefault(mid, []).append(tid)
+                batch_targets.setdefault(mid, set()).add(target)
+            batches = {mid: ids for mid, ids in batches.items() if len(ids) > 1}
+        finally:
+            session.close()
+
+        # requesters + jogadores dos lotes (pro link do Roblox): uma busca por guild
+        members: dict[int, discord.Member | None] = {}
+        for gid in {tx.guild_id for tx in rows}:
+            guild = self.bot.get_guild(gid)
+            if not guild:
+                continue
+            user_ids = {tx.requested_by for tx in rows if tx.guild_id == gid}
+            user_ids.update(u for tx in rows if tx.guild_id == gid and tx.message_id in batches for u in batch_targets[tx.message_id])
+            members.update(await get_members(guild, list(user_ids)))
+
+        bulk_rows: dict[int, TransactionRequest] = {}
+        for tx in rows:
+            requester = members.get(tx.requested_by)
+            if tx.message_id in batches:
+                bulk_rows.setdefault(tx.message_id, tx)
+                continue
+            emb = build_expired_embed(
+                tx,
+                requested_by=requester.name if requester else str(tx.requested_by),
+                to_team_name=names.get(tx.to_team_id, "Free Agent"),
+            )
+            self.edit_queue.put(tx.channel_id, tx.message_id, embed=emb, view=None)
+
+        if bulk_rows:
+            targets = {u for mid in bulk_rows for u in batch_targets[mid]}
+            roblox_ids = await _roblox_ids({u: members.get(u) for u in targets})
+            session = get_session()
+            try:
+                for mid, tx in bulk_rows.items():
+                    ids = batches[mid]
+                    requester = members.get(tx.requested_by)
+                    # mesmo rótulo do envio (member.name); quem saiu do servidor vira menção
+                    view = BulkTxReviewView(ids, roblox_ids, requester.name if requester else f"<@{tx.requested_by}>")
+                    emb = view.render(session)
+                    still_pending = session.query(func.count(TransactionRequest.id)).filter(
+                        TransactionRequest.id.in_(ids), TransactionRequest.status == "PENDING",
+                    ).scalar()
+                    self.edit_queue.put(tx.channel_id, mid, embed=emb, view=view if still_pending else None)
+            finally:
+                session.close()
+        return counts
+
+    @tasks.loop(minutes=10)
+    async def expiry_sweeper(self):
+        counts = await self._sweep_expired()
+        if counts:
+            log.info("Transactions expiradas: %s", counts)
+
+    @expiry_sweeper.before_loop
+    async def _before_expiry_sweeper(self):
+        await self.bot.wait_until_ready()
+
+    @app_commands.command(name="tx_sweep", description="Expira agora as transactions pendentes antigas (admin).")
+    async def tx_sweep(self, interaction: discord.Interaction):
+        if not isinstance(interaction.user, discord.Member) or not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("Só admin.", ephemeral=True)
+            return
+
+        # busca de membros + fila de edição podem passar dos 3s: responde antes
+        await interaction.response.defer(ephemeral=True)
+        counts = await self._sweep_expired(interaction.guild_id or 0)
+        if not counts:
+            await interaction.followup.send("Nenhuma transaction expirada.", ephemeral=True)
+            return
+        txt = "\n".join(f"- **{action}**: {n}" for action, n in counts.items())
+        await interaction.followup.send(
+            f"Transactions expiradas:\n{txt}\n\nMensagens na fila de edição: {self.edit_queue.pending()}",
+            ephemeral=True,
+        )
 
     @app_commands.command(name="team_add", description="Cadastra um time na liga (nome + role + captain).")
     @app_commands.describe(name="Nome do time", role="Cargo do time", captain="Capitão do time")
@@ -500,26 +1064,33 @@ class TransactionsCog(commands.Cog):
             await interaction.response.send_message("Só admin.", ephemeral=True)
             return
 
+        guild_id = interaction.guild_id or 0
         session = get_session()
         try:
-            if session.query(Team).filter_by(name=name).first():
+            if session.query(Team).filter_by(guild_id=guild_id, name=name).first():
                 await interaction.response.send_message("Time já existe.", ephemeral=True)
                 return
 
-            t = Team(name=name, role_id=role.id, captain_user_id=captain.id)
+            t = Team(guild_id=guild_id, name=name, role_id=role.id, captain_user_id=captain.id)
             session.add(t)
             session.commit()
+            team_names(guild_id).add(name)
+            team_roles(guild_id)[role.id] = t.id
+            audit.emit(guild_id, interaction.user.id, "team.created", f"team:{t.id}", name=name, role_id=role.id, captain=captain.id)
 
             # roles
             await captain.add_roles(role, reason="Team captain set on team_add")
-            cap_global = interaction.guild.get_role(CFG.CAPTAIN_ROLE_ID) if (interaction.guild and CFG.CAPTAIN_ROLE_ID) else None
+            captain_role_id = guild_config(guild_id).captain_role_id
+            cap_global = interaction.guild.get_role(captain_role_id) if (interaction.guild and captain_role_id) else None
             if cap_global:
                 await captain.add_roles(cap_global, reason="Captain role set on team_add")
 
             # DB register captain (pra achar time do captain depois)
-            captain_row = await _ensure_player_row(session, interaction.guild_id or 0, captain)
-            captain_row.team_id = t.id
+            captain_row = await _ensure_player_row(session, guild_id, captain)
+            old_team_id = captain_row.team_id
+            move_player(session, captain_row, t.id, "Captain")
             session.commit()
+            invalidate_roster(guild_id, old_team_id, t.id)
 
             await interaction.response.send_message(f"Time **{name}** cadastrado. Captain: {captain.mention}", ephemeral=True)
         finally:
@@ -529,7 +1100,7 @@ class TransactionsCog(commands.Cog):
     async def team_list(self, interaction: discord.Interaction):
         session = get_session()
         try:
-            teams = session.query(Team).order_by(Team.name.asc()).all()
+            teams = session.query(Team).filter_by(guild_id=interaction.guild_id).order_by(Team.name.asc()).all()
             if not teams:
                 await interaction.response.send_message("Nenhum time cadastrado.", ephemeral=True)
                 return
@@ -538,6 +1109,38 @@ class TransactionsCog(commands.Cog):
         finally:
             session.close()
 
+    @app_commands.command(name="tx_history", description="Histórico de transactions de um jogador (inclui seasons arquivadas).")
+    @app_commands.describe(player="Jogador")
+    async def tx_history(self, interaction: discord.Interaction, player: discord.User):
+        session = get_session()
+        try:
+            rows = []
+            for model in (TransactionRequest, TransactionRequestArchive):
+                rows += (
+                    session.query(model)
+                    .filter(model.guild_id == interaction.guild_id, model.target_user_id == player.id)
+                    .order_by(model.created_at.desc())
+                    .limit(20)
+                    .all()
+                )
+            rows.sort(key=lambda r: r.created_at, reverse=True)
+            rows = rows[:20]
+            if not rows:
+                await interaction.response.send_message("Nenhuma transaction pra esse jogador.", ephemeral=True)
+                return
+
+            team_ids = {r.to_team_id for r in rows if r.to_team_id}
+            names = dict(session.query(Team.id, Team.name).filter(Team.id.in_(team_ids)).all()) if team_ids else {}
+            lines = []
+            for r in rows:
+                season = f" • {r.season}" if isinstance(r, TransactionRequestArchive) else ""
+                dest = names.get(r.to_team_id, "Free Agent")
+                lines.append(f"`{r.created_at:%Y-%m-%d}` {r.action} → **{dest}** • {r.status}{season}")
+            emb = discord.Embed(title=f"Transactions • {player.name}", description="\n".join(lines), color=PENDING_COLOR)
+            await interaction.response.send_message(embed=emb, ephemeral=True)
+        finally:
+            session.close()
+
     # ---- TRANSACTIONS (sem team_name)
     @app_commands.command(name="tr_add", description="Transaction: adicionar jogador no SEU time.")
     @app_commands.describe(player="Jogador", role="Role no time (Vice/Court/Player)")
@@ -559,6 +1162,143 @@ class TransactionsCog(commands.Cog):
     async def tr_transfer(self, interaction: discord.Interaction, player: discord.Member):
         await self._create_tx(interaction, action="TRANSFER", player=player, requested_role=None)
 
+    # ---- BULK
+    @app_commands.command(name="tr_add_bulk", description="Transaction: adicionar vários jogadores no SEU time.")
+    @app_commands.describe(players="Menções ou IDs dos jogadores", role="Role no time (igual pra todos)")
+    @app_commands.choices(role=[
+        app_commands.Choice(name="Vice Captain", value="Vice Captain"),
+        app_commands.Choice(name="Court Captain", value="Court Captain"),
+        app_commands.Choice(name="Player", value="Player"),
+    ])
+    async def tr_add_bulk(self, interaction: discord.Interaction, players: str, role: app_commands.Choice[str]):
+        requester = interaction.user
+        if not isinstance(requester, discord.Member) or not interaction.guild:
+            await interaction.response.send_message("Use no servidor.", ephemeral=True)
+            return
+
+        if not can_open_transactions(requester):
+            await interaction.response.send_message("Apenas Captain/Vice Captain podem abrir transactions.", ephemeral=True)
+            return
+        if await throttle(interaction, "tr_add_bulk"):
+            return
+
+        user_ids = parse_user_ids(players)
+        if not user_ids:
+            await interaction.response.send_message("Não achei nenhuma menção/ID de jogador.", ephemeral=True)
+            return
+        if len(user_ids) > BULK_MAX_ROWS:
+            await interaction.response.send_message(f"Máximo de {BULK_MAX_ROWS} jogadores por lote.", ephemeral=True)
+            return
+
+        # DB + busca de membros podem passar dos 3s da interação
+        await interaction.response.defer(thinking=True)
+        guild_id = interaction.guild_id or 0
+        session = get_session()
+        try:
+            requester_team = await _get_requester_team(session, guild_id, requester)
+            if not requester_team:
+                await fail_after_defer(
+                    interaction,
+                    "Não consegui identificar seu time. (Confere se seu time foi cadastrado com /team_add e se você tem o cargo do time.)",
+                )
+                return
+
+            found = await get_members(interaction.guild, user_ids)
+            members, entries, errors = {}, [], []
+            for n, uid in enumerate(user_ids, start=1):
+                m = found.get(uid)
+                if not m:
+                    errors.append(f"#{n}: <@{uid}> não está no servidor.")
+                    continue
+                members[uid] = m
+                entries.append((f"#{n}", uid, "ADD", requester_team.id, role.value))
+
+            await self._submit_bulk(interaction, session, entries, errors, members)
+        finally:
+            session.close()
+
+    @app_commands.command(name="tr_bulk_csv", description="Transactions em lote via CSV (admin): user_id,action,team,role")
+    @app_commands.describe(file="CSV com colunas user_id,action(ADD/REMOVE),team,role")
+    async def tr_bulk_csv(self, interaction: discord.Interaction, file: discord.Attachment):
+        if not isinstance(interaction.user, discord.Member) or not interaction.user.guild_permissions.administrator or not interaction.guild:
+            await interaction.response.send_message("Só admin.", ephemeral=True)
+            return
+        if await throttle(interaction, "tr_bulk_csv"):
+            return
+
+        # download do anexo + DB + busca de membros podem passar dos 3s da interação
+        await interaction.response.defer(thinking=True)
+        raw = (await file.read()).decode("utf-8-sig", errors="replace")
+        rows = [r for r in csv.reader(io.StringIO(raw)) if any(c.strip() for c in r)]
+        if rows and rows[0][0].strip().lower() == "user_id":
+            rows = rows[1:]
+        if not rows:
+            await fail_after_defer(interaction, "CSV vazio.")
+            return
+        if len(rows) > BULK_MAX_ROWS:
+            await fail_after_defer(interaction, f"Máximo de {BULK_MAX_ROWS} linhas por lote.")
+            return
+
+        guild_id = interaction.guild_id or 0
+        session = get_session()
+        try:
+            wanted = {r[2].strip().lower() for r in rows if len(r) > 2 and r[2].strip()}
+            teams = {
+                t.name.lower(): t
+                for t in session.query(Team).filter(Team.guild_id == guild_id, func.lower(Team.name).in_(wanted)).all()
+            } if wanted else {}
+
+            members, entries, errors = {}, [], []
+            for n, r in enumerate(rows, start=1):
+                cells = [c.strip() for c in r] + ["", "", "", ""]
+                uid_txt, action, team_txt, role_txt = cells[0], cells[1].upper(), cells[2], cells[3] or "Player"
+                label = f"linha {n}"
+
+                if not uid_txt.isdigit():
+                    errors.append(f"{label}: user_id inválido.")
+                    continue
+                if action not in ("ADD", "REMOVE"):
+                    errors.append(f"{label}: action deve ser ADD ou REMOVE.")
+                    continue
+                team = teams.get(team_txt.lower())
+                if not team:
+                    errors.append(f"{label}: time **{team_txt or '—'}** não cadastrado.")
+                    continue
+                if role_txt not in ROLE_KEYS:
+                    errors.append(f"{label}: role deve ser {', '.join(ROLE_KEYS)}.")
+                    continue
+
+                uid = int(uid_txt)
+                members[uid] = None
+                entries.append((label, uid, action, team.id, role_txt if action == "ADD" else "Player"))
+
+            members.update(await get_members(interaction.guild, list(members)))
+            await self._submit_bulk(interaction, session, entries, errors, members)
+        finally:
+            session.close()
+
+    async def _submit_bulk(self, interaction: discord.Interaction, session, entries, errors, members):
+        guild_id = interaction.guild_id or 0
+        valid, invalid = _validate_bulk(session, guild_id, entries) if entries else ([], [])
+        errors = errors + invalid
+        if not valid:
+            await fail_after_defer(interaction, "Nenhuma transaction criada.\n" + "\n".join(errors)[:1900])
+            return
+
+        usernames = {uid: str(m) for uid, m in members.items() if m}
+        tx_ids = _create_bulk_rows(session, guild_id, interaction.user.id, valid, usernames)
+
+        view = BulkTxReviewView(tx_ids, await _roblox_ids(members), interaction.user.name)
+        msg = await interaction.followup.send(embed=view.render(session), view=view, wait=True)
+        # guarda a mensagem do lote nas rows pra o sweeper conseguir editar quando expirar
+        session.query(TransactionRequest).filter(TransactionRequest.id.in_(tx_ids)).update(
+            {TransactionRequest.channel_id: msg.channel.id, TransactionRequest.message_id: msg.id},
+            synchronize_session=False,
+        )
+        session.commit()
+        if errors:
+            await interaction.followup.send("Linhas ignoradas:\n" + "\n".join(errors)[:1900], ephemeral=True)
+
     async def _create_tx(
         self,
         interaction: discord.Interaction,
@@ -574,6 +1314,8 @@ class TransactionsCog(commands.Cog):
         if not can_open_transactions(requester):
             await interaction.response.send_message("Apenas Captain/Vice Captain podem abrir transactions.", ephemeral=True)
             return
+        if await throttle(interaction, f"tr_{action.lower()}"):
+            return
 
         guild_id = interaction.guild_id or 0
 
@@ -607,6 +1349,16 @@ class TransactionsCog(commands.Cog):
             from_team_id = target_current_team_id if action == "TRANSFER" else None
             to_team_id = requester_team.id if action in ("ADD", "TRANSFER") else None
 
+            # limites do roster (contadores do time, sem COUNT)
+            if to_team_id:
+                err = cap_violation(
+                    requester_team, guild_config(guild_id),
+                    target_current_team_id, target_row.team_role, team_role_after(action, requested_role),
+                )
+                if err:
+                    await interaction.response.send_message(err, ephemeral=True)
+                    return
+
             tx = TransactionRequest(
                 guild_id=guild_id,
                 requested_by=requester.id,
@@ -624,6 +1376,7 @@ class TransactionsCog(commands.Cog):
             )
             session.add(tx)
             session.commit()
+            audit.emit(guild_id, requester.id, "tx.created", f"tx:{tx.id}", action=action, target=player.id, from_team_id=from_team_id, to_team_id=to_team_id)
 
             to_team_name = requester_team.name if to_team_id else "Free Agent"
 
@@ -638,6 +1391,12 @@ class TransactionsCog(commands.Cog):
             view = TxReviewView(tx.id, rbx_id)
             await interaction.response.send_message(embed=emb, view=view)
 
+            # guarda a mensagem pra poder editar se expirar
+            msg = await interaction.original_response()
+            tx.channel_id = msg.channel.id
+            tx.message_id = msg.id
+            session.commit()
+
         finally:
             session.close()
 
@@ -1,5 +1,200 @@
+import logging
+
+from sqlalchemy import BigInteger, Integer, inspect, text
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.exc import OperationalError
+
+from config import CFG
 from .session import Base, engine
 from . import models  # noqa: F401
 
-def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+log = logging.getLogger(__name__)
+
+# player_names <- players/transactions (só insere nome novo: nome antigo continua buscável)
+# player_names_fts <- player_names (external content, tokenizer trigram)
+# WHERE NOT EXISTS em vez de INSERT OR IGNORE: dentro de um upsert (import de jogadores)
+# o ON CONFLICT do statement de fora substitui o OR IGNORE do trigger e estoura o índice único
+_NEW_NAME = """
+    INSERT INTO player_names(guild_id, user_id, name) SELECT {g}, {u}, {n}
+    WHERE NOT EXISTS (SELECT 1 FROM player_names WHERE guild_id = {g} AND user_id = {u} AND name = {n});
+"""
+_PLAYER_SEARCH_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS player_names_fts
+       USING fts5(name, content='player_names', content_rowid='id', tokenize='trigram')""",
+    """CREATE TRIGGER IF NOT EXISTS trg_player_names_ai AFTER INSERT ON player_names BEGIN
+         INSERT INTO player_names_fts(rowid, name) VALUES (new.id, new.name);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_player_names_ad AFTER DELETE ON player_names BEGIN
+         INSERT INTO player_names_fts(player_names_fts, rowid, name) VALUES ('delete', old.id, old.name);
+       END""",
+    # recriados a cada startup: DB antigo tem a versão com INSERT OR IGNORE
+    "DROP TRIGGER IF EXISTS trg_players_name_ai",
+    "DROP TRIGGER IF EXISTS trg_players_name_au",
+    "DROP TRIGGER IF EXISTS trg_tx_name_ai",
+    "CREATE TRIGGER trg_players_name_ai AFTER INSERT ON players BEGIN"
+    + _NEW_NAME.format(g="new.guild_id", u="new.user_id", n="new.username") + "END",
+    "CREATE TRIGGER trg_players_name_au AFTER UPDATE OF username ON players BEGIN"
+    + _NEW_NAME.format(g="new.guild_id", u="new.user_id", n="new.username") + "END",
+    "CREATE TRIGGER trg_tx_name_ai AFTER INSERT ON transaction_requests BEGIN"
+    + _NEW_NAME.format(g="new.guild_id", u="new.target_user_id", n="new.target_username") + "END",
+)
+
+_PLAYER_NAMES_BACKFILL = """
+    INSERT OR IGNORE INTO player_names(guild_id, user_id, name)
+    SELECT guild_id, user_id, username FROM players
+    UNION SELECT guild_id, target_user_id, target_username FROM transaction_requests
+    UNION SELECT guild_id, target_user_id, target_username FROM transaction_requests_archive
+"""
+
+def _add_missing_columns(conn) -> set[str]:
+    """create_all não altera tabelas existentes: adiciona colunas novas (nullable/server_default)."""
+    insp = inspect(conn)
+    added: set[str] = set()
+    for table in Base.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        existing = {c["name"] for c in insp.get_columns(table.name)}
+        for col in table.columns:
+            if col.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col.type.compile(dialect=conn.dialect)}"
+            if col.server_default is not None:
+                ddl += f" DEFAULT {col.server_default.arg}"
+            conn.execute(text(ddl))
+            added.add(f"{table.name}.{col.name}")
+    return added
+
+def _widen_snowflake_columns(conn):
+    """PostgreSQL criado quando os ids do Discord eram Integer: INTEGER (32 bits) -> BIGINT."""
+    if conn.dialect.name != "postgresql":
+        return
+    insp = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        current = {c["name"]: c["type"] for c in insp.get_columns(table.name)}
+        for col in table.columns:
+            old = current.get(col.name)
+            if isinstance(col.type, BigInteger) and isinstance(old, Integer) and not isinstance(old, BigInteger):
+                conn.execute(text(f"ALTER TABLE {table.name} ALTER COLUMN {col.name} TYPE BIGINT"))
+                log.info("%s.%s alargada pra BIGINT", table.name, col.name)
+
+def _create_missing_indexes(conn):
+    for table in Base.metadata.sorted_tables:
+        for idx in table.indexes:
+            idx.create(bind=conn, checkfirst=True)
+
+def _rebuild_teams_without_name_unique(conn):
+    """
+    DB de antes do multi-guild tem UNIQUE(name) inline em teams: o mesmo nome em outra liga
+    dá IntegrityError. SQLite não tem DROP CONSTRAINT: cria a tabela nova, copia, troca.
+    """
+    if conn.dialect.name != "sqlite":
+        for uc in inspect(conn).get_unique_constraints("teams"):
+            if uc["column_names"] == ["name"]:
+                conn.execute(text(f'ALTER TABLE teams DROP CONSTRAINT "{uc["name"]}"'))
+        return
+
+    # o inspect do SQLite só enxerga UNIQUE (name) no fim da tabela, não "name ... UNIQUE" na coluna:
+    # os dois viram um sqlite_autoindex de origem 'u'
+    legacy = [
+        idx for _, idx, unique, origin, _ in conn.exec_driver_sql("PRAGMA index_list('teams')")
+        if unique and origin == "u"
+        and [r[2] for r in conn.exec_driver_sql(f"PRAGMA index_info('{idx}')")] == ["name"]
+    ]
+    if not legacy:
+        return
+
+    table = Base.metadata.tables["teams"]
+    have = {c["name"] for c in inspect(conn).get_columns("teams")}
+    cols = ", ".join(c.name for c in table.columns if c.name in have)
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect)).replace("CREATE TABLE teams ", "CREATE TABLE teams_new ", 1)
+    conn.execute(text(ddl))
+    conn.execute(text(f"INSERT INTO teams_new ({cols}) SELECT {cols} FROM teams"))
+    conn.execute(text("DROP TABLE teams"))
+    conn.execute(text("ALTER TABLE teams_new RENAME TO teams"))
+    # índices (uq_team_guild_name) voltam no _create_missing_indexes
+    log.info("teams recriada sem UNIQUE(name)")
+
+def _backfill_team_guild(conn) -> int:
+    """
+    Times criados antes do multi-guild (guild_id = 0): o guild vem dos jogadores do time;
+    time sem jogador vai pro LEGACY_GUILD_ID (ou o único guild que já aparece no banco).
+    Retorna quantos times mudaram.
+    """
+    fixed = conn.execute(text(
+        "UPDATE teams SET guild_id = (SELECT max(p.guild_id) FROM players p WHERE p.team_id = teams.id) "
+        "WHERE guild_id = 0 AND EXISTS (SELECT 1 FROM players p WHERE p.team_id = teams.id AND p.guild_id <> 0)"
+    )).rowcount
+
+    legacy = CFG.LEGACY_GUILD_ID
+    if not legacy:
+        guilds = conn.execute(text(
+            "SELECT guild_id FROM players WHERE guild_id <> 0 "
+            "UNION SELECT guild_id FROM transaction_requests WHERE guild_id <> 0"
+        )).scalars().all()
+        legacy = guilds[0] if len(guilds) == 1 else CFG.GUILD_ID
+    if legacy:
+        fixed += conn.execute(text("UPDATE teams SET guild_id = :g WHERE guild_id = 0"), {"g": legacy}).rowcount
+    elif conn.execute(text("SELECT 1 FROM teams WHERE guild_id = 0")).first():
+        log.warning("Times sem guild (guild_id=0): defina LEGACY_GUILD_ID no .env")
+    return fixed
+
+# um INSERT por (fonte, lado); só o último resultado de cada match (re-post corrige placar)
+_TEAM_RESULTS_BACKFILL = """
+    INSERT INTO team_results (guild_id, team_id, opponent_id, match_id, points_for, points_against, played_at)
+    SELECT r.guild_id, t.id, o.id, r.match_id, r.{pf}, r.{pa}, r.created_at
+    FROM {results} r
+    JOIN {schedule} s ON s.guild_id = r.guild_id AND s.match_id = r.match_id
+    JOIN teams t ON t.guild_id = s.guild_id AND lower(t.name) = lower(s.{side})
+    JOIN teams o ON o.guild_id = s.guild_id AND lower(o.name) = lower(s.{other}) AND o.id <> t.id
+    WHERE r.id = (SELECT max(r2.id) FROM {results} r2 WHERE r2.guild_id = r.guild_id AND r2.match_id = r.match_id)
+"""
+
+def _backfill_team_results(conn):
+    """Indexa os resultados já postados (temporada atual + arquivo); refaz do zero (é derivada de match_result)."""
+    conn.execute(text("DELETE FROM team_results"))
+    for results, schedule in (("match_result", "match_schedule"), ("match_result_archive", "match_schedule_archive")):
+        for side, other, pf, pa in (("team_a", "team_b", "team_a_score", "team_b_score"), ("team_b", "team_a", "team_b_score", "team_a_score")):
+            conn.execute(text(_TEAM_RESULTS_BACKFILL.format(results=results, schedule=schedule, side=side, other=other, pf=pf, pa=pa)))
+
+def _backfill_team_counts(conn):
+    """DB antigo: contador de roster nasce zerado; conta o total uma vez a partir de players (role antiga não está no DB)."""
+    conn.execute(text(
+        "UPDATE teams SET player_count = (SELECT count(*) FROM players WHERE players.team_id = teams.id)"
+    ))
+
+def _create_player_search(conn):
+    """FTS5 trigram pro /player_search (SQLite >= 3.34). Sem suporte: a busca cai no LIKE."""
+    if conn.dialect.name != "sqlite":
+        return
+    exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'player_names_fts'")).first()
+    try:
+        for ddl in _PLAYER_SEARCH_DDL:
+            conn.execute(text(ddl))
+    except OperationalError as e:
+        log.warning("FTS5 trigram indisponível (%s): /player_search usa LIKE", e)
+        return
+    if not exists:
+        conn.execute(text(_PLAYER_NAMES_BACKFILL))
+        conn.execute(text("INSERT INTO player_names_fts(player_names_fts) VALUES ('rebuild')"))
+
+def init_db(bind=None):
+    """Cria/migra o schema. `bind`: outro engine (migração, testes); padrão o do DB_URL."""
+    bind = bind or engine
+    new_tables = set(Base.metadata.tables) - set(inspect(bind).get_table_names())
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        added = _add_missing_columns(conn)
+        _widen_snowflake_columns(conn)
+        _rebuild_teams_without_name_unique(conn)
+        _create_missing_indexes(conn)
+        teams_fixed = _backfill_team_guild(conn)
+        if "teams.player_count" in added:
+            _backfill_team_counts(conn)
+        # times que só agora ganharam guild ficaram de fora do índice: refaz
+        if "team_results" in new_tables or teams_fixed:
+            _backfill_team_results(conn)
+    # DDL do FTS numa transação separada: se o SQLite não tiver trigram, o resto já foi commitado
+    with bind.begin() as conn:
+        _create_player_search(conn)
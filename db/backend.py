@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from config import CFG
+
+# diferenças entre os bancos suportados (SQLite padrão, PostgreSQL) ficam aqui
+SUPPORTED = ("sqlite", "postgresql")
+
+
+def engine_options(db_url: str) -> dict:
+    """kwargs do create_engine por backend."""
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    if backend not in SUPPORTED:
+        raise RuntimeError(f"DB_URL: backend '{backend}' não suportado (use sqlite ou postgresql).")
+
+    opts: dict = {"echo": False, "future": True}
+    if backend == "postgresql":
+        opts.update(
+            pool_size=CFG.DB_POOL_SIZE,
+            max_overflow=CFG.DB_MAX_OVERFLOW,
+            pool_pre_ping=True,  # conexão derrubada pelo servidor/pgbouncer não vira erro no comando
+            pool_recycle=1800,
+            # executemany (import, audit, result_bulk) vira INSERT ... VALUES em páginas
+            insertmanyvalues_page_size=CFG.DB_BATCH_SIZE,
+        )
+        if url.get_driver_name() == "psycopg":
+            # psycopg 3: prepara no servidor a query que repete N vezes na mesma conexão
+            opts["connect_args"] = {"prepare_threshold": CFG.DB_PREPARE_THRESHOLD}
+    return opts
+
+
+def install_sqlite_pragmas(engine: Engine) -> None:
+    """WAL: leitura (autocomplete, /roster) não trava enquanto o audit/transaction grava."""
+    if engine.dialect.name != "sqlite" or not CFG.SQLITE_WAL:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA busy_timeout=5000")
+        cur.close()
+
+
+def _insert_for(session):
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def upsert_stmt(session, model, index_elements: list, update_cols: list[str]):
+    """
+    INSERT ... ON CONFLICT (index_elements) DO UPDATE do dialeto da sessão.
+    Executar com uma lista de dicts (executemany); o conflito precisa ser um índice único.
+    """
+    stmt = _insert_for(session)(model)
+    return stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={c: stmt.excluded[c] for c in update_cols},
+    )
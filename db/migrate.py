@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sys
+
+from sqlalchemy import create_engine, func, inspect, select, text
+
+from config import CFG
+from .backend import engine_options, install_sqlite_pragmas
+from .session import Base
+
+
+def copy_database(src_url: str, dst_url: str, batch: int = CFG.DB_BATCH_SIZE) -> dict[str, int]:
+    """
+    Copia todas as tabelas de um banco pro outro (ex: SQLite -> PostgreSQL), mantendo os ids.
+    O destino precisa estar vazio; o schema é criado lá pelo create_all.
+    Rode com o bot parado. Retorna rows copiadas por tabela.
+    """
+    src = create_engine(src_url, **engine_options(src_url))
+    dst = create_engine(dst_url, **engine_options(dst_url))
+    install_sqlite_pragmas(dst)
+    Base.metadata.create_all(bind=dst)
+
+    src_insp = inspect(src)
+    counts: dict[str, int] = {}
+    with src.connect() as s, dst.begin() as d:
+        for table in Base.metadata.sorted_tables:
+            if d.execute(select(func.count()).select_from(table)).scalar():
+                raise RuntimeError(f"Destino não está vazio ({table.name}).")
+
+        # pai antes de filho (players -> teams)
+        for table in Base.metadata.sorted_tables:
+            if not src_insp.has_table(table.name):
+                counts[table.name] = 0
+                continue
+            # DB de origem antigo pode não ter colunas novas: o default do destino preenche
+            have = {c["name"] for c in src_insp.get_columns(table.name)}
+            cols = [c for c in table.columns if c.name in have]
+            n = 0
+            result = s.execution_options(yield_per=batch).execute(select(*cols))
+            for part in result.mappings().partitions(batch):
+                d.execute(table.insert(), [dict(r) for r in part])
+                n += len(part)
+            counts[table.name] = n
+
+        if dst.dialect.name == "postgresql":
+            # ids vieram da origem: a sequence tem que continuar depois do maior
+            for table in Base.metadata.sorted_tables:
+                pk = table.autoincrement_column
+                if pk is not None:
+                    d.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk.name}'), "
+                        f"coalesce(max({pk.name}), 0) + 1, false) FROM {table.name}"
+                    ))
+    src.dispose()
+    dst.dispose()
+    return counts
+
+
+def main(argv: list[str]) -> int:
+    """
+    Uso local (bot parado):
+      python -m db.migrate <DB_URL destino> [DB_URL origem]
+    Origem padrão: DB_URL do .env. Depois aponte DB_URL pro destino e suba o bot
+    (o init_db cria o que for específico do backend, ex: busca FTS no SQLite).
+    """
+    if not argv:
+        print(main.__doc__)
+        return 2
+
+    dst_url = argv[0]
+    src_url = argv[1] if len(argv) > 1 else CFG.DB_URL
+    if dst_url == src_url:
+        print("Origem e destino são o mesmo banco.")
+        return 2
+
+    try:
+        counts = copy_database(src_url, dst_url)
+    except RuntimeError as e:
+        print(f"FALHOU {e}")
+        return 1
+    for name, n in counts.items():
+        print(f"{name}\t{n}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,19 +1,54 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, ForeignKey, UniqueConstraint, Text
+from sqlalchemy import String, Integer, BigInteger, DateTime, ForeignKey, UniqueConstraint, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Boolean
 
 from .session import Base
 
+# ids do Discord (snowflake) passam de 32 bits: BigInteger (no SQLite INTEGER já é 64 bits;
+# no PostgreSQL o init_db alarga colunas antigas). id/contadores internos seguem Integer.
+
+class GuildSettings(Base):
+    """Config por servidor (liga). Campo None = usa o default do config.py."""
+    __tablename__ = "guild_settings"
+
+    guild_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+
+    captain_role_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    vice_captain_role_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    court_captain_role_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    player_role_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    referee_role_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    media_role_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Transaction Team: se setado, só esse cargo (e admin) aprova/nega; senão vale Captain/Vice
+    review_role_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    transactions_channel_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    matches_channel_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    roster_max_players: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    roster_max_vice_captains: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    roster_max_court_captains: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
 class Team(Base):
     __tablename__ = "teams"
+    __table_args__ = (
+        # nome único por liga (Index pra o init_db conseguir criar em DB antigo)
+        Index("uq_team_guild_name", "guild_id", "name", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    name: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
-    role_id: Mapped[int] = mapped_column(Integer, nullable=False)
-    captain_user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
+    role_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    captain_user_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    # contadores do roster: atualizados junto com players.team_id (reparo: /roster_recount)
+    player_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    vice_captain_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    court_captain_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     players: Mapped[list["Player"]] = relationship(back_populates="team")
 
@@ -24,24 +59,58 @@ class Player(Base):
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    guild_id: Mapped[int] = mapped_column(Integer, nullable=False)
-    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     username: Mapped[str] = mapped_column(String(128), nullable=False)
 
     team_id: Mapped[int | None] = mapped_column(ForeignKey("teams.id"), nullable=True)
+    team_role: Mapped[str | None] = mapped_column(String(24), nullable=True)  # Captain/Vice Captain/Court Captain/Player
     team: Mapped["Team | None"] = relationship(back_populates="players")
 
-class TransactionRequest(Base):
-    __tablename__ = "transaction_requests"
+class PlayerName(Base):
+    """
+    Nomes já vistos por jogador (players.username + transactions.target_username),
+    base do /player_search. No SQLite é alimentada por triggers (ver db/__init__.py).
+    """
+    __tablename__ = "player_names"
+    __table_args__ = (
+        Index("uq_player_name", "guild_id", "user_id", "name", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    guild_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+
+class AuditEvent(Base):
+    """Log append-only de mudanças de estado (só INSERT, nunca UPDATE/DELETE)."""
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_guild_created", "guild_id", "created_at"),
+        Index("ix_audit_subject", "subject"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    actor_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)  # None = sistema (sweeper, scheduler)
+
+    event: Mapped[str] = mapped_column(String(32), nullable=False)  # ex: tx.created, match.closed
+    subject: Mapped[str] = mapped_column(String(64), nullable=False)  # ex: tx:123, match:SA-...
+    data: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+# ----------------------------
+# Colunas compartilhadas entre tabela "quente" e arquivo (season rollover)
+# ----------------------------
+class TransactionColumns:
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     # Quem pediu
-    requested_by: Mapped[int] = mapped_column(Integer, nullable=False)
+    requested_by: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     # Jogador alvo
-    target_user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    target_user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     target_username: Mapped[str] = mapped_column(String(128), nullable=False)
 
     # Ação: ADD / REMOVE / TRANSFER
@@ -53,23 +122,24 @@ class TransactionRequest(Base):
 
     reason: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    status: Mapped[str] = mapped_column(String(16), default="PENDING")  # PENDING/APPROVED/REJECTED
+    status: Mapped[str] = mapped_column(String(16), default="PENDING")  # PENDING/APPROVED/REJECTED/EXPIRED
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     requested_role: Mapped[str | None] = mapped_column(String(24), nullable=True)
 
-    reviewed_by: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    reviewed_by: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     reviewed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     player_confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
-    player_confirmed_by: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    player_confirmed_by: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     player_confirmed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
-class MatchSchedule(Base):
-    __tablename__ = "match_schedule"
+    # Mensagem pública da transaction (pra editar quando expirar)
+    channel_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    message_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    guild_id: Mapped[int] = mapped_column(Integer, nullable=False)
+class MatchScheduleColumns:
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     match_id: Mapped[str] = mapped_column(String(32), unique=True, nullable=False)  # tipo "SA-2026-0001"
     team_a: Mapped[str] = mapped_column(String(64), nullable=False)
@@ -81,19 +151,97 @@ class MatchSchedule(Base):
     status: Mapped[str] = mapped_column(String(16), default="OPEN")  # OPEN/CLOSED/DONE
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
-class MatchResult(Base):
-    __tablename__ = "match_result"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    guild_id: Mapped[int] = mapped_column(Integer, nullable=False)
+class MatchResultColumns:
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     match_id: Mapped[str] = mapped_column(String(32), nullable=False)  # referencia schedule.match_id
 
     team_a_score: Mapped[int] = mapped_column(Integer, nullable=False)
     team_b_score: Mapped[int] = mapped_column(Integer, nullable=False)
 
-    mvp_a: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    mvp_b: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    mvp_a: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    mvp_b: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    posted_by: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class ArchiveColumns:
+    season: Mapped[str] = mapped_column(String(32), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class TransactionRequest(TransactionColumns, Base):
+    __tablename__ = "transaction_requests"
+    __table_args__ = (
+        # sweeper de expiração: WHERE status = 'PENDING' AND created_at < cutoff
+        Index("ix_tx_status_created", "status", "created_at"),
+        Index("ix_tx_guild_target", "guild_id", "target_user_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+class MatchSchedule(MatchScheduleColumns, Base):
+    __tablename__ = "match_schedule"
+    __table_args__ = (
+        Index("ix_match_guild_created", "guild_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+class MatchResult(MatchResultColumns, Base):
+    __tablename__ = "match_result"
+    __table_args__ = (
+        Index("ix_result_guild_match", "guild_id", "match_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+class TeamResult(Base):
+    """
+    Índice de resultados por time: 2 rows por match (uma de cada lado), com ids
+    em vez dos nomes livres do schedule. Histórico e h2h são um range no índice.
+    Não vai pro arquivo na virada de season (vale pra todas as seasons).
+    """
+    __tablename__ = "team_results"
+    __table_args__ = (
+        Index("uq_team_result_match", "team_id", "match_id", unique=True),
+        Index("ix_team_result_history", "team_id", "played_at", "id"),
+        Index("ix_team_result_h2h", "team_id", "opponent_id", "played_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    team_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    opponent_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    match_id: Mapped[str] = mapped_column(String(32), nullable=False)
+
+    points_for: Mapped[int] = mapped_column(Integer, nullable=False)
+    points_against: Mapped[int] = mapped_column(Integer, nullable=False)
+    played_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+# ----------------------------
+# Arquivo (seasons passadas): mesmo id da tabela quente + season
+# ----------------------------
+class TransactionRequestArchive(TransactionColumns, ArchiveColumns, Base):
+    __tablename__ = "transaction_requests_archive"
+    __table_args__ = (
+        Index("ix_tx_archive_guild_target", "guild_id", "target_user_id"),
+        Index("ix_tx_archive_guild_season", "guild_id", "season"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+class MatchScheduleArchive(MatchScheduleColumns, ArchiveColumns, Base):
+    __tablename__ = "match_schedule_archive"
+    __table_args__ = (
+        Index("ix_match_archive_guild_season", "guild_id", "season"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+class MatchResultArchive(MatchResultColumns, ArchiveColumns, Base):
+    __tablename__ = "match_result_archive"
+    __table_args__ = (
+        Index("ix_result_archive_guild_match", "guild_id", "match_id"),
+    )
 
-    posted_by: Mapped[int] = mapped_column(Integer, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
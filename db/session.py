@@ -1,12 +1,14 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from config import CFG
+from .backend import engine_options, install_sqlite_pragmas
 
-engine = create_engine(CFG.DB_URL, echo=False, future=True)
+engine = create_engine(CFG.DB_URL, **engine_options(CFG.DB_URL))
+install_sqlite_pragmas(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 class Base(DeclarativeBase):
     pass
 
 def get_session():
-    return SessionLocal()
\ No newline at end of file
+    return SessionLocal()
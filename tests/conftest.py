@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# antes de importar o bot: DB padrão num arquivo temporário, nunca o league.db de verdade
+os.environ["DB_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'league.db'}"
+os.environ.setdefault("GUILD_ID", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from db.backend import engine_options, install_sqlite_pragmas  # noqa: E402
+
+# PostgreSQL só com URL explícita: o schema public do banco é APAGADO a cada teste.
+# ex: TEST_PG_URL=postgresql+psycopg://postgres@/league_test?host=/tmp/pgdata
+PG_URL = os.getenv("TEST_PG_URL", "")
+
+
+def _pg_reachable(url: str) -> str | None:
+    """None se der pra conectar; senão o motivo do skip."""
+    try:
+        eng = create_engine(url, **engine_options(url))
+        with eng.connect():
+            pass
+        eng.dispose()
+    except Exception as e:  # driver ausente, servidor fora do ar, auth...
+        return f"PostgreSQL indisponível ({type(e).__name__})"
+    return None
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def db_url(request, tmp_path):
+    """DB_URL vazio pra cada teste, nos dois backends."""
+    if request.param == "sqlite":
+        yield f"sqlite:///{tmp_path / 'league.db'}"
+        return
+
+    if not PG_URL:
+        pytest.skip("TEST_PG_URL não definido")
+    reason = _pg_reachable(PG_URL)
+    if reason:
+        pytest.skip(reason)
+    eng = create_engine(PG_URL)
+    with eng.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    eng.dispose()
+    yield PG_URL
+
+
+@pytest.fixture
+def engine(db_url):
+    eng = create_engine(db_url, **engine_options(db_url))
+    install_sqlite_pragmas(eng)
+    yield eng
+    eng.dispose()
@@ -0,0 +1,115 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from utils import checks
+from utils import guild_config as gc
+
+GUILD = 1468750429012754464
+CAPTAIN, VICE, REVIEW, REFEREE, MEDIA, OTHER = 11, 12, 13, 14, 15, 99
+
+
+def _cfg(**overrides) -> gc.GuildConfig:
+    base = gc.GuildConfig(**{
+        **gc._defaults(GUILD),
+        "captain_role_id": CAPTAIN,
+        "vice_captain_role_id": VICE,
+        "referee_role_id": REFEREE,
+        "media_role_id": MEDIA,
+        "review_role_id": 0,
+    })
+    return replace(base, **overrides)
+
+
+def _member(*role_ids: int, admin: bool = False, member_id: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=member_id,
+        guild=SimpleNamespace(id=GUILD),
+        roles=[SimpleNamespace(id=r) for r in role_ids],
+        guild_permissions=SimpleNamespace(administrator=admin),
+    )
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    # config em memória: nada de DB
+    gc._cache[GUILD] = _cfg()
+    checks._policies.clear()
+    yield
+    gc._cache.pop(GUILD, None)
+    checks._policies.clear()
+
+
+def test_compile_policy_role_sets():
+    policy = checks.compile_policy(_cfg())
+    assert policy.open_transactions == {CAPTAIN, VICE}
+    assert policy.post_results == {REFEREE, MEDIA}
+
+
+def test_compile_policy_skips_unset_roles():
+    policy = checks.compile_policy(_cfg(captain_role_id=0, media_role_id=0))
+    assert policy.open_transactions == {VICE}
+    assert policy.post_results == {REFEREE}
+
+
+def test_review_falls_back_to_captains():
+    assert checks.compile_policy(_cfg()).review_transactions == {CAPTAIN, VICE}
+    assert checks.compile_policy(_cfg(review_role_id=REVIEW)).review_transactions == {REVIEW}
+
+
+def test_review_role_replaces_captains():
+    gc._cache[GUILD] = _cfg(review_role_id=REVIEW)
+    assert checks.can_review_transactions(_member(REVIEW))
+    assert not checks.can_review_transactions(_member(CAPTAIN))
+    # abrir continua sendo de Captain/Vice
+    assert checks.can_open_transactions(_member(CAPTAIN))
+    assert not checks.can_open_transactions(_member(REVIEW))
+
+
+def test_policy_reused_until_config_changes():
+    first = checks.policy_for(GUILD)
+    assert checks.policy_for(GUILD) is first
+
+    # update_guild_settings troca o objeto no _cache
+    gc._cache[GUILD] = _cfg(captain_role_id=OTHER)
+    second = checks.policy_for(GUILD)
+    assert second is not first
+    assert OTHER in second.open_transactions
+
+
+def test_config_change_applies_immediately():
+    member = _member(CAPTAIN)
+    assert checks.can_open_transactions(member)
+    gc._cache[GUILD] = _cfg(captain_role_id=OTHER)
+    assert not checks.can_open_transactions(member)
+
+
+def test_admin_overrides_every_action():
+    admin = _member(OTHER, admin=True)
+    assert checks.can_open_transactions(admin)
+    assert checks.can_review_transactions(admin)
+    assert checks.can_post_results(admin)
+
+    nobody = _member(OTHER, member_id=2)
+    assert not checks.can_open_transactions(nobody)
+    assert not checks.can_review_transactions(nobody)
+    assert not checks.can_post_results(nobody)
+
+
+def test_role_change_applies_immediately():
+    member = _member(OTHER)
+    assert not checks.can_post_results(member)
+
+    member.roles.append(SimpleNamespace(id=REFEREE))
+    assert checks.can_post_results(member)
+
+    member.roles.pop()
+    assert not checks.can_post_results(member)
+
+
+def test_admin_flag_change_applies_immediately():
+    member = _member(OTHER, admin=True)
+    assert checks.can_post_results(member)
+    member.guild_permissions.administrator = False
+    assert not checks.can_post_results(member)
@@ -0,0 +1,141 @@
+"""Conformidade SQLite x PostgreSQL: schema, upsert, snowflakes e db.migrate."""
+import pytest
+from sqlalchemy import BigInteger, create_engine, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+from db import init_db
+from db.backend import upsert_stmt
+from db.migrate import copy_database
+from db.models import Player, Team, TransactionRequest
+
+GUILD = 1468750429012754464  # snowflake de verdade: não cabe em INTEGER 32 bits
+USER = 1472738473684238477
+ROLE = 1469045798271582268
+
+
+def _legacy_schema(conn):
+    """teams/players de antes do multi-guild e dos ids BIGINT."""
+    pk = "SERIAL PRIMARY KEY" if conn.dialect.name == "postgresql" else "INTEGER PRIMARY KEY AUTOINCREMENT"
+    conn.execute(text(
+        f"CREATE TABLE teams (id {pk}, name VARCHAR(64) NOT NULL UNIQUE, "
+        "role_id INTEGER NOT NULL, captain_user_id INTEGER)"
+    ))
+    conn.execute(text(
+        f"CREATE TABLE players (id {pk}, guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+        "username VARCHAR(128) NOT NULL, team_id INTEGER REFERENCES teams(id), "
+        "CONSTRAINT uq_player_guild_user UNIQUE (guild_id, user_id))"
+    ))
+    conn.execute(text("INSERT INTO teams (name, role_id) VALUES ('Alpha', 1)"))
+    conn.execute(text(
+        "INSERT INTO players (guild_id, user_id, username, team_id) VALUES (42, 7, 'old', 1)"
+    ))
+
+
+def _seed(session, n_players=3):
+    team = Team(guild_id=GUILD, name="Alpha", role_id=ROLE, captain_user_id=USER)
+    session.add(team)
+    session.flush()
+    for i in range(n_players):
+        session.add(Player(guild_id=GUILD, user_id=USER + i, username=f"p{i}", team_id=team.id, team_role="Player"))
+    session.add(TransactionRequest(
+        guild_id=GUILD, requested_by=USER, target_user_id=USER + 1, target_username="p1",
+        action="ADD", to_team_id=team.id,
+    ))
+    session.commit()
+    return team
+
+
+def test_init_db_is_idempotent(engine):
+    init_db(engine)
+    tables = set(inspect(engine).get_table_names())
+    init_db(engine)
+    assert set(inspect(engine).get_table_names()) == tables
+    assert {"teams", "players", "team_results", "transaction_requests"} <= tables
+
+
+def test_snowflakes_round_trip(engine):
+    init_db(engine)
+    with Session(engine) as s:
+        _seed(s, n_players=1)
+        p = s.scalars(select(Player)).one()
+        assert (p.guild_id, p.user_id) == (GUILD, USER)
+        assert s.scalars(select(Team.role_id)).one() == ROLE
+
+
+def test_init_db_upgrades_legacy_schema(engine):
+    with engine.begin() as conn:
+        _legacy_schema(conn)
+    init_db(engine)
+    init_db(engine)
+
+    insp = inspect(engine)
+    if engine.dialect.name == "postgresql":
+        cols = {c["name"]: c["type"] for c in insp.get_columns("players")}
+        assert isinstance(cols["user_id"], BigInteger)
+    assert not [uc for uc in insp.get_unique_constraints("teams") if uc["column_names"] == ["name"]]
+
+    with Session(engine) as s:
+        # guild do time antigo vem dos jogadores
+        assert s.scalars(select(Team.guild_id)).one() == 42
+        # mesmo nome em outra liga, com ids de 64 bits
+        s.add(Team(guild_id=GUILD, name="Alpha", role_id=ROLE))
+        s.add(Player(guild_id=GUILD, user_id=USER, username="new"))
+        s.commit()
+        assert s.scalar(select(func.count()).select_from(Team)) == 2
+
+
+def test_upsert_stmt_inserts_then_updates(engine):
+    init_db(engine)
+    with Session(engine) as s:
+        stmt = upsert_stmt(s, Player, [Player.guild_id, Player.user_id], ["username", "team_role"])
+        rows = [dict(guild_id=GUILD, user_id=USER + i, username=f"p{i}", team_role=None) for i in range(3)]
+        s.execute(stmt, rows)
+        s.commit()
+
+        rows[1].update(username="renamed", team_role="Player")
+        s.execute(stmt, rows)
+        s.commit()
+
+        got = dict(s.execute(select(Player.user_id, Player.username).order_by(Player.user_id)).all())
+        assert got == {USER: "p0", USER + 1: "renamed", USER + 2: "p2"}
+        assert s.scalar(select(Player.team_role).where(Player.user_id == USER + 1)) == "Player"
+
+
+def test_migrate_copies_rows_and_resets_sequences(tmp_path, db_url):
+    src_url = f"sqlite:///{tmp_path / 'src.db'}"
+    src = create_engine(src_url)
+    init_db(src)
+    with Session(src) as s:
+        _seed(s)
+    src.dispose()
+
+    counts = copy_database(src_url, db_url, batch=2)  # batch pequeno: passa por várias partições
+    assert counts["teams"] == 1 and counts["players"] == 3 and counts["transaction_requests"] == 1
+
+    dst = create_engine(db_url)
+    init_db(dst)
+    with Session(dst) as s:
+        # id novo continua depois dos copiados (sequence do PostgreSQL ajustada)
+        team = Team(guild_id=GUILD, name="Beta", role_id=ROLE + 1)
+        tx = TransactionRequest(
+            guild_id=GUILD, requested_by=USER, target_user_id=USER, target_username="p0", action="ADD",
+        )
+        s.add_all([team, tx])
+        s.commit()
+        assert (team.id, tx.id) == (2, 2)
+        assert s.scalar(select(func.max(Player.user_id))) == USER + 2
+    dst.dispose()
+
+
+def test_migrate_refuses_non_empty_target(tmp_path, db_url):
+    src_url = f"sqlite:///{tmp_path / 'src.db'}"
+    init_db(create_engine(src_url))
+
+    dst = create_engine(db_url)
+    init_db(dst)
+    with Session(dst) as s:
+        _seed(s)
+    dst.dispose()
+
+    with pytest.raises(RuntimeError, match="não está vazio"):
+        copy_database(src_url, db_url)
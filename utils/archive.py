@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import delete, insert, literal, select, text
+
+from db.models import (
+    MatchResult,
+    MatchResultArchive,
+    MatchSchedule,
+    MatchScheduleArchive,
+    TransactionRequest,
+    TransactionRequestArchive,
+)
+
+# o que sai da tabela quente na virada de season
+ARCHIVE_TX_STATUSES = ("APPROVED", "REJECTED", "EXPIRED")
+ARCHIVE_MATCH_STATUSES = ("DONE",)
+
+
+def _move(session, src, dst, where, season: str, now: datetime, batch: int) -> int:
+    """
+    Copia (INSERT ... SELECT) e apaga da tabela quente em lotes por id,
+    um commit por lote (não segura lock de escrita por muito tempo).
+    """
+    src_t, dst_t = src.__table__, dst.__table__
+    cols = [c.name for c in src_t.columns]
+    moved = 0
+    while True:
+        ids = [i for (i,) in session.execute(select(src_t.c.id).where(*where).order_by(src_t.c.id).limit(batch))]
+        if not ids:
+            return moved
+
+        rows = select(
+            *[src_t.c[name] for name in cols],
+            literal(season).label("season"),
+            literal(now).label("archived_at"),
+        ).where(src_t.c.id.in_(ids))
+        session.execute(insert(dst_t).from_select(cols + ["season", "archived_at"], rows))
+        session.execute(delete(src_t).where(src_t.c.id.in_(ids)))
+        session.commit()
+        moved += len(ids)
+
+
+def archive_season(session, guild_id: int, season: str, batch: int) -> dict[str, int]:
+    now = datetime.utcnow()
+    tx = TransactionRequest.__table__.c
+    ms = MatchSchedule.__table__.c
+    mr = MatchResult.__table__.c
+
+    counts = {
+        "transactions": _move(
+            session, TransactionRequest, TransactionRequestArchive,
+            (tx.guild_id == guild_id, tx.status.in_(ARCHIVE_TX_STATUSES)),
+            season, now, batch,
+        ),
+    }
+
+    # resultados antes dos matches (a subquery depende do match ainda estar na tabela quente)
+    done_matches = select(ms.match_id).where(ms.guild_id == guild_id, ms.status.in_(ARCHIVE_MATCH_STATUSES))
+    counts["results"] = _move(
+        session, MatchResult, MatchResultArchive,
+        (mr.guild_id == guild_id, mr.match_id.in_(done_matches)),
+        season, now, batch,
+    )
+    counts["matches"] = _move(
+        session, MatchSchedule, MatchScheduleArchive,
+        (ms.guild_id == guild_id, ms.status.in_(ARCHIVE_MATCH_STATUSES)),
+        season, now, batch,
+    )
+    return counts
+
+
+def incremental_vacuum(engine, pages: int = 0) -> str:
+    """
+    Devolve ao disco as páginas liberadas pelo arquivamento (só SQLite).
+    Na primeira vez liga auto_vacuum=INCREMENTAL (exige um VACUUM completo);
+    depois disso cada rollover só roda PRAGMA incremental_vacuum.
+    """
+    if engine.dialect.name != "sqlite":
+        return "n/a"
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+        if mode != 2:
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            conn.execute(text("VACUUM"))
+            return "full"
+
+        freelist = conn.execute(text("PRAGMA freelist_count")).scalar()
+        # o pragma libera uma página por step e não tem result set (execute() só dá 1 step):
+        # executescript (sqlite3_exec) roda até o fim
+        conn.connection.dbapi_connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+        left = conn.execute(text("PRAGMA freelist_count")).scalar()
+        return f"incremental ({freelist - left} páginas)"
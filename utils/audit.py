@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import insert
+
+from config import CFG
+from db.models import AuditEvent
+from db.session import get_session
+
+log = logging.getLogger(__name__)
+
+
+class AuditLog:
+    """
+    Write-behind: emit() só enfileira em memória (não toca no DB no clique);
+    uma task grava em lote a cada N segundos ou quando o buffer enche.
+    O INSERT roda numa thread; com o DB fora do ar o buffer fica limitado a `max_buffer`.
+    """
+
+    def __init__(self, flush_seconds: float, flush_size: int, max_buffer: int):
+        self.flush_seconds = flush_seconds
+        self.flush_size = flush_size
+        self.max_buffer = max_buffer
+        self.dropped = 0  # total descartado desde o start
+        self._unreported = 0
+        self._buffer: list[dict[str, Any]] = []
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def emit(self, guild_id: int | None, actor_id: int | None, event: str, subject: str, **data: Any) -> None:
+        self._buffer.append({
+            "guild_id": guild_id or 0,
+            "actor_id": actor_id,
+            "event": event,
+            "subject": subject,
+            "data": json.dumps(data, ensure_ascii=False, default=str) if data else None,
+            "created_at": datetime.utcnow(),
+        })
+        if len(self._buffer) >= self.flush_size:
+            self._full.set()
+        self._trim()
+
+    def _trim(self) -> None:
+        over = len(self._buffer) - self.max_buffer
+        if over > 0:
+            del self._buffer[:over]
+            self.dropped += over
+            self._unreported += over
+
+    def _report_drops(self) -> None:
+        # um aviso por flush, não um por evento descartado
+        if self._unreported:
+            log.warning("Audit: buffer cheio, %d eventos mais antigos descartados", self._unreported)
+            self._unreported = 0
+
+    @staticmethod
+    def _write(rows: list[dict[str, Any]]) -> None:
+        session = get_session()
+        try:
+            session.execute(insert(AuditEvent), rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    async def flush(self) -> int:
+        self._report_drops()
+        if not self._buffer:
+            return 0
+        # troca o buffer no loop (emit continua enchendo o novo); só o INSERT vai pra thread
+        rows, self._buffer = self._buffer, []
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except Exception:
+            # devolve pro buffer (na frente: são os mais antigos) e tenta de novo no próximo flush
+            self._buffer[:0] = rows
+            self._trim()
+            self._report_drops()
+            raise
+        return len(rows)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="audit-flusher")
+
+    async def stop(self) -> None:
+        """Shutdown: para a task e grava o que sobrou."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            log.exception("Audit: flush final falhou (%d eventos perdidos)", len(self._buffer))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Audit: flush falhou (%d eventos no buffer)", len(self._buffer))
+
+
+audit = AuditLog(CFG.AUDIT_FLUSH_SECONDS, CFG.AUDIT_FLUSH_SIZE, CFG.AUDIT_BUFFER_MAX)
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+import discord
+from discord import app_commands
+
+from utils.search_index import team_names
+
+
+async def team_autocomplete(interaction: discord.Interaction, current: str):
+    """Times da liga pelo índice em memória (sem DB)."""
+    return [app_commands.Choice(name=n, value=n) for n in team_names(interaction.guild_id or 0).search(current)]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import gzip
+import shutil
+import sqlite3
+import sys
+import tempfile
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.engine import make_url
+
+from config import CFG
+
+SNAPSHOT_PREFIX = "league-"
+SNAPSHOT_SUFFIX = ".db.gz"
+
+
+def sqlite_path(db_url: str = CFG.DB_URL) -> Path | None:
+    """Caminho do arquivo SQLite do DB_URL (None se não for SQLite em arquivo)."""
+    url = make_url(db_url)
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        return None
+    return Path(url.database)
+
+
+def backup_dir() -> Path:
+    path = Path(CFG.BACKUP_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _online_copy(src: Path, dst: Path) -> None:
+    """
+    Cópia consistente via API de backup do SQLite, em passos de N páginas com
+    pausa entre eles: o bot continua lendo/escrevendo enquanto copia.
+    """
+    with closing(sqlite3.connect(src)) as src_conn, closing(sqlite3.connect(dst)) as dst_conn:
+        src_conn.backup(dst_conn, pages=CFG.BACKUP_PAGES_PER_STEP, sleep=CFG.BACKUP_STEP_SLEEP)
+
+
+def _gzip(src: Path, dst: Path) -> None:
+    with open(src, "rb") as fin, gzip.open(dst, "wb", compresslevel=6) as fout:
+        shutil.copyfileobj(fin, fout)
+
+
+def _gunzip(src: Path, dst: Path) -> None:
+    with gzip.open(src, "rb") as fin, open(dst, "wb") as fout:
+        shutil.copyfileobj(fin, fout)
+
+
+def create_snapshot(db_path: Path | None = None, rotate: bool = True) -> Path:
+    """
+    Gera backups/league-YYYYmmdd-HHMMSS.db.gz e aplica a rotação. Bloqueante: rodar numa thread.
+    rotate=False: snapshot de segurança do restore (a rotação apagaria o snapshot que vai ser restaurado).
+    """
+    db_path = db_path or sqlite_path()
+    if db_path is None:
+        raise RuntimeError("Backup online só funciona com SQLite em arquivo.")
+
+    out = backup_dir() / f"{SNAPSHOT_PREFIX}{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}{SNAPSHOT_SUFFIX}"
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(tmp) / "snapshot.db"
+        _online_copy(db_path, raw)
+        _gzip(raw, out)
+
+    if rotate:
+        rotate_snapshots(CFG.BACKUP_KEEP)
+    return out
+
+
+def list_snapshots() -> list[Path]:
+    """Mais novo primeiro (o timestamp no nome ordena)."""
+    return sorted(backup_dir().glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"), reverse=True)
+
+
+def rotate_snapshots(keep: int) -> list[Path]:
+    removed = list_snapshots()[keep:]
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+def resolve_snapshot(name: str) -> Path | None:
+    """Aceita só nomes de dentro do BACKUP_DIR (sem path traversal)."""
+    path = backup_dir() / Path(name).name
+    return path if path.is_file() and path.name.endswith(SNAPSHOT_SUFFIX) else None
+
+
+def _check_db(path: Path) -> tuple[bool, str]:
+    with closing(sqlite3.connect(path)) as conn:
+        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        tables = conn.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+    return result == "ok", f"integrity_check={result} • {tables} tabelas"
+
+
+def verify_snapshot(path: Path) -> tuple[bool, str]:
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            raw = Path(tmp) / "verify.db"
+            _gunzip(path, raw)
+            return _check_db(raw)
+    except (OSError, EOFError, sqlite3.DatabaseError) as e:
+        return False, f"arquivo inválido: {e}"
+
+
+def restore_snapshot(path: Path, db_path: Path | None = None) -> str:
+    """
+    Restaura o snapshot por cima do DB atual usando a própria API de backup
+    (respeita os locks do SQLite, nada de copiar arquivo com o bot escrevendo).
+    Verifica antes; erro -> RuntimeError e o DB atual fica intacto.
+    """
+    db_path = db_path or sqlite_path()
+    if db_path is None:
+        raise RuntimeError("Restore só funciona com SQLite em arquivo.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = Path(tmp) / "restore.db"
+        try:
+            _gunzip(path, raw)
+            ok, detail = _check_db(raw)
+        except (gzip.BadGzipFile, EOFError, sqlite3.DatabaseError) as e:
+            ok, detail = False, f"arquivo inválido: {e}"
+        if not ok:
+            raise RuntimeError(f"Snapshot não passou na verificação ({detail}).")
+        _online_copy(raw, db_path)
+    return detail
+
+
+def main(argv: list[str]) -> int:
+    """
+    Uso local (sem o bot):
+      python -m utils.backup create
+      python -m utils.backup list
+      python -m utils.backup verify <arquivo>
+      python -m utils.backup restore <arquivo>
+    """
+    if not argv or argv[0] not in ("create", "list", "verify", "restore"):
+        print(main.__doc__)
+        return 2
+
+    cmd = argv[0]
+    if cmd == "create":
+        print(create_snapshot())
+        return 0
+    if cmd == "list":
+        for path in list_snapshots():
+            print(f"{path.name}\t{path.stat().st_size / 1024:.0f} KB")
+        return 0
+
+    if len(argv) < 2:
+        print(main.__doc__)
+        return 2
+    path = Path(argv[1])
+    if cmd == "verify":
+        ok, detail = verify_snapshot(path)
+        print(("OK " if ok else "FALHOU ") + detail)
+        return 0 if ok else 1
+
+    print(restore_snapshot(path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
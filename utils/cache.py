@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Dict com limite de tamanho (LRU) e TTL opcional em segundos."""
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        stored_at, value = item
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def prune(self) -> int:
+        """Remove as entradas vencidas pelo TTL (get() só limpa a chave que lê). Retorna quantas saíram."""
+        if self.ttl is None:
+            return 0
+        cutoff = time.monotonic() - self.ttl
+        expired = [k for k, (stored_at, _) in self._data.items() if stored_at < cutoff]
+        for k in expired:
+            del self._data[k]
+        return len(expired)
+
+
+# Páginas renderizadas do /roster: (guild_id, team_id) -> {cursor: (texto, próximo cursor)}
+roster_pages = LRUCache(maxsize=512)
+
+
+def invalidate_roster(guild_id: int, *team_ids: int | None) -> None:
+    """Chamar sempre que um time ganha/perde jogador."""
+    for team_id in team_ids:
+        if team_id:
+            roster_pages.pop((guild_id, team_id))
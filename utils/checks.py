@@ -1,35 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
 import discord
-from config import CFG
+from utils.guild_config import GuildConfig, guild_config
 
 
-def has_role(member: discord.Member, role_id: int) -> bool:
-    return any(r.id == role_id for r in member.roles)
+@dataclass(frozen=True)
+class PermissionPolicy:
+    """Role-IDs que liberam cada ação, compilados uma vez por config de guild."""
+    open_transactions: frozenset[int]
+    review_transactions: frozenset[int]
+    post_results: frozenset[int]
 
 
-# --- Transactions: só Captain/Vice Captain (ou Admin) ---
-def can_open_transactions(member: discord.Member) -> bool:
-    if member.guild_permissions.administrator:
-        return True
+# guild_id -> (config usada, policy compilada)
+_policies: dict[int, tuple[GuildConfig, PermissionPolicy]] = {}
+
+
+def compile_policy(cfg: GuildConfig) -> PermissionPolicy:
+    open_ids = frozenset(r for r in (cfg.captain_role_id, cfg.vice_captain_role_id) if r)
+    return PermissionPolicy(
+        open_transactions=open_ids,
+        review_transactions=frozenset((cfg.review_role_id,)) if cfg.review_role_id else open_ids,
+        post_results=frozenset(r for r in (cfg.referee_role_id, cfg.media_role_id) if r),
+    )
 
-    if CFG.CAPTAIN_ROLE_ID and has_role(member, CFG.CAPTAIN_ROLE_ID):
-        return True
 
-    if has_role(member, CFG.VICE_CAPTAIN_ROLE_ID):
-        return True
+def policy_for(guild_id: int) -> PermissionPolicy:
+    cfg = guild_config(guild_id)
+    cached = _policies.get(guild_id)
+    # guild_config devolve o mesmo objeto até a config mudar -> recompila só nessa hora
+    if cached is None or cached[0] is not cfg:
+        cached = _policies[guild_id] = (cfg, compile_policy(cfg))
+    return cached[1]
 
-    return False
 
+def _allowed(member: discord.Member, action: str) -> bool:
+    # sem cache de decisão: uma passada nos cargos já custa o mesmo que montar a chave
+    allowed = getattr(policy_for(member.guild.id), action)
+    return member.guild_permissions.administrator or any(r.id in allowed for r in member.roles)
 
+
+# --- Transactions: só Captain/Vice Captain (ou Admin) ---
+def can_open_transactions(member: discord.Member) -> bool:
+    return _allowed(member, "open_transactions")
+
+
+# --- Review: Transaction Team (se configurado) senão Captain/Vice (ou Admin) ---
 def can_review_transactions(member: discord.Member) -> bool:
-    return can_open_transactions(member)
+    return _allowed(member, "review_transactions")
 
 
 # --- Results: Admin / Referee / Media ---
 def can_post_results(member: discord.Member) -> bool:
-    if member.guild_permissions.administrator:
-        return True
-
-    return any(
-        r.id in (CFG.REFEREE_ROLE_ID, CFG.MEDIA_ROLE_ID)
-        for r in member.roles
-    )
\ No newline at end of file
+    return _allowed(member, "post_results")
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import select
+
+from db.backend import upsert_stmt
+from db.models import Team, Player, TransactionRequest, MatchResult
+from utils.roster_caps import recount_teams
+from utils.team_history import resolve_team_ids
+
+# kind -> model exportável (sempre filtrado por guild_id)
+EXPORT_MODELS = {
+    "teams": Team,
+    "players": Player,
+    "transactions": TransactionRequest,
+    "results": MatchResult,
+}
+
+STREAM_CHUNK = 500  # rows por fetch do cursor / por executemany
+SPOOL_MAX_BYTES = 2 * 1024 * 1024  # acima disso o arquivo vai pro disco
+
+
+def _cell(v):
+    if isinstance(v, datetime):
+        return v.isoformat()
+    return v
+
+
+def export_table(session, kind: str, guild_id: int, fmt: str) -> tuple[tempfile.SpooledTemporaryFile, int]:
+    """
+    Exporta a tabela em CSV ou JSON (array) direto pra um arquivo temporário,
+    lendo o cursor em blocos (yield_per) — nunca monta a lista inteira em memória.
+    Retorna (arquivo posicionado no início, quantidade de rows).
+    """
+    table = EXPORT_MODELS[kind].__table__
+    cols = [c.name for c in table.columns]
+    stmt = (
+        select(table)
+        .where(table.c.guild_id == guild_id)
+        .order_by(table.c.id)
+        .execution_options(stream_results=True, yield_per=STREAM_CHUNK)
+    )
+
+    raw = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    out = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    count = 0
+
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(cols)
+        for row in session.execute(stmt):
+            writer.writerow([_cell(v) for v in row])
+            count += 1
+    else:
+        out.write("[")
+        for row in session.execute(stmt):
+            out.write(",\n" if count else "\n")
+            out.write(json.dumps(dict(zip(cols, map(_cell, row))), ensure_ascii=False))
+            count += 1
+        out.write("\n]\n")
+
+    out.flush()
+    out.detach()
+    raw.seek(0)
+    return raw, count
+
+
+# ----------------------------
+# IMPORT (CSV)
+# ----------------------------
+IMPORT_COLUMNS = {
+    "teams": ("name", "role_id", "captain_user_id"),
+    "players": ("user_id", "username", "team"),
+}
+
+
+@dataclass
+class ImportReport:
+    kind: str
+    inserted: int = 0
+    updated: int = 0
+    errors: list[str] = field(default_factory=list)
+    dry_run: bool = True
+
+    def summary(self) -> str:
+        head = "Dry-run (nada gravado)" if self.dry_run else "Importado"
+        lines = [f"**{head}** • {self.kind}", f"Novos: **{self.inserted}** • Atualizados: **{self.updated}** • Erros: **{len(self.errors)}**"]
+        if self.errors:
+            shown = self.errors[:15]
+            lines += [""] + shown
+            if len(self.errors) > len(shown):
+                lines.append(f"... e mais {len(self.errors) - len(shown)}")
+        return "\n".join(lines)
+
+
+def _read_csv(data: bytes, expected: tuple[str, ...]) -> tuple[list[dict[str, str]], list[str]]:
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8-sig", errors="replace")))
+    header = [h.strip().lower() for h in (reader.fieldnames or [])]
+    missing = [c for c in expected if c not in header]
+    if missing:
+        return [], [f"Colunas faltando: {', '.join(missing)} (esperado: {','.join(expected)})"]
+    reader.fieldnames = header
+    return [{k: (v or "").strip() for k, v in r.items() if k} for r in reader], []
+
+
+def _int_or_none(text: str) -> int | None:
+    return int(text) if text.isdigit() else None
+
+
+def _chunks(items: list) -> list:
+    return [items[i:i + STREAM_CHUNK] for i in range(0, len(items), STREAM_CHUNK)]
+
+
+def _executemany_chunks(session, stmt, rows: list[dict]) -> None:
+    for chunk in _chunks(rows):
+        session.execute(stmt, chunk)
+
+
+def import_teams(session, guild_id: int, data: bytes, dry_run: bool) -> ImportReport:
+    report = ImportReport(kind="teams", dry_run=dry_run)
+    rows, report.errors = _read_csv(data, IMPORT_COLUMNS["teams"])
+
+    clean: dict[str, dict] = {}
+    for n, r in enumerate(rows, start=2):  # linha 1 = header
+        role_id = _int_or_none(r["role_id"])
+        if not r["name"] or len(r["name"]) > 64:
+            report.errors.append(f"linha {n}: nome inválido.")
+        elif role_id is None:
+            report.errors.append(f"linha {n}: role_id inválido.")
+        elif r["name"] in clean:
+            report.errors.append(f"linha {n}: time **{r['name']}** repetido.")
+        else:
+            clean[r["name"]] = {
+                "guild_id": guild_id,
+                "name": r["name"],
+                "role_id": role_id,
+                "captain_user_id": _int_or_none(r["captain_user_id"]),
+            }
+
+    existing: set[str] = set()
+    for chunk in _chunks(list(clean)):
+        existing.update(name for (name,) in session.query(Team.name).filter(Team.guild_id == guild_id, Team.name.in_(chunk)))
+    report.updated = len(existing)
+    report.inserted = len(clean) - len(existing)
+
+    if dry_run or not clean:
+        return report
+
+    stmt = upsert_stmt(session, Team, [Team.guild_id, Team.name], ["role_id", "captain_user_id"])
+    _executemany_chunks(session, stmt, list(clean.values()))
+    session.commit()
+    return report
+
+
+def import_players(session, guild_id: int, data: bytes, dry_run: bool) -> ImportReport:
+    report = ImportReport(kind="players", dry_run=dry_run)
+    rows, report.errors = _read_csv(data, IMPORT_COLUMNS["players"])
+
+    # case-insensitive, igual ao /tr_bulk_csv
+    team_ids = resolve_team_ids(session, guild_id, *{r["team"] for r in rows if r["team"]})
+
+    clean: dict[int, dict] = {}
+    for n, r in enumerate(rows, start=2):
+        user_id = _int_or_none(r["user_id"])
+        if user_id is None:
+            report.errors.append(f"linha {n}: user_id inválido.")
+        elif not r["username"]:
+            report.errors.append(f"linha {n}: username vazio.")
+        elif r["team"] and r["team"] not in team_ids:
+            report.errors.append(f"linha {n}: time **{r['team']}** não cadastrado.")
+        elif user_id in clean:
+            report.errors.append(f"linha {n}: user_id {user_id} repetido.")
+        else:
+            clean[user_id] = {
+                "guild_id": guild_id,
+                "user_id": user_id,
+                "username": r["username"][:128],
+                "team_id": team_ids.get(r["team"]) if r["team"] else None,
+            }
+
+    # user_id -> (team_id, team_role) de quem já existe
+    existing: dict[int, tuple[int | None, str | None]] = {}
+    for chunk in _chunks(list(clean)):
+        existing.update(
+            (uid, (team_id, team_role))
+            for uid, team_id, team_role in session.query(Player.user_id, Player.team_id, Player.team_role)
+            .filter(Player.guild_id == guild_id, Player.user_id.in_(chunk))
+        )
+    report.updated = len(existing)
+    report.inserted = len(clean) - len(existing)
+
+    if dry_run or not clean:
+        return report
+
+    # mesmo time: mantém a role; trocou de time: entra como Player (Vice/Court não vai junto pro cap do time novo)
+    for uid, row in clean.items():
+        old_team_id, old_role = existing.get(uid, (None, None))
+        if row["team_id"] is None:
+            row["team_role"] = None
+        elif row["team_id"] == old_team_id:
+            row["team_role"] = old_role
+        else:
+            row["team_role"] = "Player"
+
+    stmt = upsert_stmt(session, Player, [Player.guild_id, Player.user_id], ["username", "team_id", "team_role"])
+    _executemany_chunks(session, stmt, list(clean.values()))
+    session.commit()
+    # upsert em massa não passa pelo move_player: recalcula os contadores do guild
+    recount_teams(session, guild_id)
+    return report
+
+
+IMPORTERS = {
+    "teams": import_teams,
+    "players": import_players,
+}
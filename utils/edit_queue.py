@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import discord
+
+log = logging.getLogger(__name__)
+
+
+class MessageEditQueue:
+    """
+    Fila de edições de mensagem com ritmo fixo (N por segundo).
+    Usado por jobs em background que editam muitas mensagens de uma vez,
+    pra não estourar o rate limit do Discord.
+    """
+
+    def __init__(self, client: discord.Client, per_second: float):
+        self.client = client
+        self.interval = 1.0 / max(per_second, 0.1)
+        self._queue: asyncio.Queue[tuple[int, int, dict[str, Any]]] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def put(self, channel_id: int, message_id: int, **edit_kwargs: Any) -> None:
+        self._queue.put_nowait((channel_id, message_id, edit_kwargs))
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="message-edit-queue")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            channel_id, message_id, kwargs = await self._queue.get()
+            try:
+                channel = self.client.get_partial_messageable(channel_id)
+                await channel.get_partial_message(message_id).edit(**kwargs)
+            except discord.NotFound:
+                pass  # mensagem apagada
+            except discord.HTTPException:
+                log.exception("Falha ao editar mensagem %s/%s", channel_id, message_id)
+            finally:
+                self._queue.task_done()
+            await asyncio.sleep(self.interval)
@@ -1,4 +1,5 @@
 import discord
+import time
 from datetime import datetime
 
 GREEN = 0x2ecc71
@@ -15,6 +16,54 @@ def e_ok(title: str, desc: str) -> discord.Embed:
 def e_err(title: str, desc: str) -> discord.Embed:
     return discord.Embed(title=title, description=desc, color=RED)
 
+async def fail_after_defer(interaction: discord.Interaction, content: str | None = None, *, embed: discord.Embed | None = None) -> None:
+    """Erro depois de um defer público: tira o "pensando..." e responde só pra quem chamou."""
+    try:
+        await interaction.delete_original_response()
+    except discord.HTTPException:
+        pass
+    await interaction.followup.send(content, embed=embed, ephemeral=True)
+
+class EmbedTemplate:
+    """
+    Layout fixo de um embed (cor, footer, nomes/ordem dos fields) declarado uma vez;
+    render() só preenche os valores. Valor vazio vira "—" (mantém o tamanho do embed).
+    """
+
+    def __init__(self, *, color: int, fields: tuple[str, ...] = (), footer: str | None = None, inline: bool = False):
+        self.color = color
+        self.fields = fields
+        self.footer = footer
+        self.inline = inline
+
+    def render(
+        self,
+        *values: str | None,
+        title: str | None = None,
+        description: str | None = None,
+        color: int | None = None,
+        thumbnail: str | None = None,
+    ) -> discord.Embed:
+        emb = discord.Embed(color=self.color if color is None else color, title=title, description=description)
+        for name, value in zip(self.fields, values):
+            emb.add_field(name=name, value=value or "—", inline=self.inline)
+        if self.footer:
+            emb.set_footer(text=self.footer)
+        if thumbnail:
+            emb.set_thumbnail(url=thumbnail)
+        return emb
+
+
+_stamp: tuple[int, str] = (-1, "")
+
+def utc_stamp() -> str:
+    """'YYYY-mm-dd HH:MM UTC', formatado uma vez por minuto."""
+    global _stamp
+    minute = int(time.time() // 60)
+    if _stamp[0] != minute:
+        _stamp = (minute, datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"))
+    return _stamp[1]
+
 def e_tx(title: str, fields: dict[str, str], status: str) -> discord.Embed:
     color = GRAY
     if status == "APPROVED":
@@ -25,5 +74,5 @@ def e_tx(title: str, fields: dict[str, str], status: str) -> discord.Embed:
     emb = discord.Embed(title=title, color=color)
     for k, v in fields.items():
         emb.add_field(name=k, value=v, inline=False)
-    emb.set_footer(text=f"Status: {status} • {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
+    emb.set_footer(text=f"Status: {status} • {utc_stamp()}")
     return emb
\ No newline at end of file
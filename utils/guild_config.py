@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+
+from config import CFG
+from db.session import get_session
+from db.models import GuildSettings
+
+
+@dataclass(frozen=True)
+class GuildConfig:
+    guild_id: int
+    captain_role_id: int
+    vice_captain_role_id: int
+    court_captain_role_id: int
+    player_role_id: int
+    referee_role_id: int
+    media_role_id: int
+    review_role_id: int
+    transactions_channel_id: int
+    matches_channel_id: int
+    roster_max_players: int
+    roster_max_vice_captains: int
+    roster_max_court_captains: int
+
+
+def _defaults(guild_id: int) -> dict[str, int]:
+    return {
+        "guild_id": guild_id,
+        "captain_role_id": CFG.CAPTAIN_ROLE_ID,
+        "vice_captain_role_id": CFG.ROLE_VICE_CAPTAIN_ID,
+        "court_captain_role_id": CFG.ROLE_COURT_CAPTAIN_ID,
+        "player_role_id": CFG.ROLE_PLAYER_ID,
+        "referee_role_id": CFG.REFEREE_ROLE_ID,
+        "media_role_id": CFG.MEDIA_ROLE_ID,
+        "review_role_id": 0,
+        "transactions_channel_id": CFG.TRANSACTIONS_CHANNEL_ID,
+        "matches_channel_id": CFG.MATCHES_CHANNEL_ID or CFG.TRANSACTIONS_CHANNEL_ID,
+        "roster_max_players": CFG.ROSTER_MAX_PLAYERS,
+        "roster_max_vice_captains": CFG.ROSTER_MAX_VICE_CAPTAINS,
+        "roster_max_court_captains": CFG.ROSTER_MAX_COURT_CAPTAINS,
+    }
+
+
+# guild_id -> GuildConfig (poucas ligas: cache sem limite)
+_cache: dict[int, GuildConfig] = {}
+
+SETTING_FIELDS = tuple(f.name for f in fields(GuildConfig) if f.name != "guild_id")
+
+
+def _build(guild_id: int, row: GuildSettings | None) -> GuildConfig:
+    values = _defaults(guild_id)
+    if row:
+        for name in SETTING_FIELDS:
+            v = getattr(row, name)
+            if v:
+                values[name] = v
+    return GuildConfig(**values)
+
+
+def guild_config(guild_id: int | None) -> GuildConfig:
+    """Config efetiva do guild: DB (guild_settings) por cima dos defaults do config.py."""
+    guild_id = guild_id or 0
+    cfg = _cache.get(guild_id)
+    if cfg is not None:
+        return cfg
+
+    session = get_session()
+    try:
+        cfg = _cache[guild_id] = _build(guild_id, session.get(GuildSettings, guild_id))
+    finally:
+        session.close()
+    return cfg
+
+
+def preload_guild_configs() -> int:
+    """Warm-up: carrega a config de todas as ligas numa query só (em vez de uma por guild no primeiro uso)."""
+    session = get_session()
+    try:
+        rows = session.query(GuildSettings).all()
+    finally:
+        session.close()
+
+    for row in rows:
+        # setdefault: não sobrescreve o que um /league_config recarregou durante o warm-up
+        _cache.setdefault(row.guild_id, _build(row.guild_id, row))
+    return len(rows)
+
+
+def update_guild_settings(guild_id: int, **changes: int | None) -> GuildConfig:
+    """Grava os campos informados (None = não mexe) e recarrega o cache."""
+    session = get_session()
+    try:
+        row = session.get(GuildSettings, guild_id)
+        if not row:
+            row = GuildSettings(guild_id=guild_id)
+            session.add(row)
+        for name, value in changes.items():
+            if value is not None and name in SETTING_FIELDS:
+                setattr(row, name, value)
+        session.commit()
+    finally:
+        session.close()
+
+    _cache.pop(guild_id, None)
+    return guild_config(guild_id)
+
+
+def reset_guild_config_cache() -> None:
+    """Depois de restaurar o banco: tudo é relido do DB."""
+    _cache.clear()
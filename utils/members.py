@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+
+import discord
+
+from config import CFG
+from utils.cache import LRUCache
+
+# (guild_id, user_id) -> Member (ou _NOT_MEMBER se saiu do servidor)
+_members = LRUCache(maxsize=CFG.MEMBER_CACHE_SIZE, ttl=CFG.MEMBER_CACHE_TTL_SECONDS)
+_NOT_MEMBER = object()
+
+QUERY_LIMIT = 100  # máximo de user_ids por query_members
+
+
+def remember(member: discord.Member) -> None:
+    """Guarda um Member que já veio no payload (ex: interaction.user)."""
+    _members.set((member.guild.id, member.id), member)
+
+
+def forget(guild_id: int, user_id: int) -> None:
+    """Chamar depois de mexer nos roles do membro (o objeto em cache fica velho)."""
+    _members.pop((guild_id, user_id))
+
+
+def _cached(guild: discord.Guild, user_id: int):
+    m = guild.get_member(user_id)  # cache do discord.py (modo chunking)
+    if m is not None:
+        return m
+    return _members.get((guild.id, user_id))
+
+
+async def get_member(guild: discord.Guild, user_id: int) -> discord.Member | None:
+    m = _cached(guild, user_id)
+    if m is not None:
+        return None if m is _NOT_MEMBER else m
+
+    try:
+        m = await guild.fetch_member(user_id)
+    except discord.NotFound:
+        _members.set((guild.id, user_id), _NOT_MEMBER)
+        return None
+    remember(m)
+    return m
+
+
+async def get_members(guild: discord.Guild, user_ids) -> dict[int, discord.Member | None]:
+    """Resolve vários membros de uma vez: cache primeiro, o resto numa query_members só."""
+    out: dict[int, discord.Member | None] = {}
+    missing: list[int] = []
+    for uid in dict.fromkeys(u for u in user_ids if u):
+        m = _cached(guild, uid)
+        if m is None:
+            missing.append(uid)
+        else:
+            out[uid] = None if m is _NOT_MEMBER else m
+
+    for i in range(0, len(missing), QUERY_LIMIT):
+        chunk = missing[i:i + QUERY_LIMIT]
+        try:
+            # limit padrão do discord.py é 5: sem ele o resto do chunk viraria _NOT_MEMBER
+            found = await guild.query_members(user_ids=chunk, limit=len(chunk), cache=False)
+        except (discord.ClientException, discord.HTTPException, asyncio.TimeoutError):
+            found = [m for m in [await get_member(guild, uid) for uid in chunk] if m]
+
+        by_id = {m.id: m for m in found}
+        for uid in chunk:
+            m = by_id.get(uid)
+            if m is not None:
+                remember(m)
+            else:
+                _members.set((guild.id, uid), _NOT_MEMBER)
+            out[uid] = m
+    return out
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import discord
+
+# cursor -> (embed da página, cursor da próxima página ou None)
+PageFetcher = Callable[[Any], tuple[discord.Embed, Any]]
+
+
+class KeysetPager(discord.ui.View):
+    """
+    Paginação por keyset: cada página é buscada a partir do cursor da anterior
+    (sem OFFSET). A view guarda a pilha de cursores visitados pro botão de voltar.
+    """
+
+    def __init__(self, fetch: PageFetcher, next_cursor: Any, *, author_id: int, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.fetch = fetch
+        self.author_id = author_id
+        self.message: discord.Message | None = None
+        self._cursors: list[Any] = [None]
+        self._next = next_cursor
+        self._sync_buttons()
+
+    @classmethod
+    async def send(
+        cls,
+        interaction: discord.Interaction,
+        fetch: PageFetcher,
+        *,
+        ephemeral: bool = False,
+        empty: discord.Embed | None = None,
+    ) -> None:
+        """Manda a primeira página; só cria a view se tiver mais de uma."""
+        emb, next_cursor = fetch(None)
+        if empty is not None and not emb.description:
+            await interaction.response.send_message(embed=empty, ephemeral=True)
+            return
+        if next_cursor is None:
+            await interaction.response.send_message(embed=emb, ephemeral=ephemeral)
+            return
+
+        view = cls(fetch, next_cursor, author_id=interaction.user.id)
+        emb.set_footer(text="Página 1")
+        await interaction.response.send_message(embed=emb, view=view, ephemeral=ephemeral)
+        view.message = await interaction.original_response()
+
+    def _sync_buttons(self):
+        self.prev_page.disabled = len(self._cursors) <= 1
+        self.next_page.disabled = self._next is None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("Só quem usou o comando pode trocar de página.", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction, cursor: Any):
+        emb, self._next = self.fetch(cursor)
+        emb.set_footer(text=f"Página {len(self._cursors)}")
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=emb, view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def prev_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if len(self._cursors) > 1:
+            self._cursors.pop()
+        await self._show(interaction, self._cursors[-1])
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self._next is None:
+            await interaction.response.defer()
+            return
+        self._cursors.append(self._next)
+        await self._show(interaction, self._next)
+
+    async def on_timeout(self):
+        if not self.message:
+            return
+        for item in self.children:
+            item.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            pass
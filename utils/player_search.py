@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, text
+
+from db.models import Player, TransactionRequest
+
+SEARCH_LIMIT = 25
+
+# prefixo primeiro, depois relevância do FTS (bm25) e nome mais curto
+_FTS_SQL = text("""
+    SELECT n.user_id, n.name
+    FROM player_names_fts f
+    JOIN player_names n ON n.id = f.rowid
+    WHERE player_names_fts MATCH :match AND n.guild_id = :guild_id
+    ORDER BY (n.name LIKE :prefix ESCAPE '\\') DESC, bm25(player_names_fts), length(n.name)
+    LIMIT :limit
+""")
+
+# trigram precisa de 3+ letras: consulta curta vai de prefixo na tabela base
+_PREFIX_SQL = text("""
+    SELECT user_id, name
+    FROM player_names
+    WHERE guild_id = :guild_id AND name LIKE :prefix ESCAPE '\\'
+    ORDER BY length(name), name
+    LIMIT :limit
+""")
+
+
+@dataclass
+class PlayerHit:
+    user_id: int
+    name: str  # nome que melhor casou
+    aliases: list[str] = field(default_factory=list)  # outros nomes que também casaram
+
+
+def _like_escape(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def has_fts(session) -> bool:
+    if session.get_bind().dialect.name != "sqlite":
+        return False
+    return session.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'player_names_fts'")).first() is not None
+
+
+def _fallback_rows(session, guild_id: int, q: str, limit: int) -> list[tuple[int, str]]:
+    """Sem FTS (outro banco / SQLite sem trigram): LIKE nas duas tabelas e ranking em Python."""
+    pattern = f"%{_like_escape(q)}%"
+    rows = set()
+    for uid_col, name_col in (
+        (Player.user_id, Player.username),
+        (TransactionRequest.target_user_id, TransactionRequest.target_username),
+    ):
+        rows.update(
+            session.query(uid_col, name_col)
+            .filter(uid_col.class_.guild_id == guild_id, func.lower(name_col).like(pattern.lower(), escape="\\"))
+            .distinct()
+            .limit(limit)
+            .all()
+        )
+    folded = q.casefold()
+    return sorted(rows, key=lambda r: (r[1].casefold().find(folded), len(r[1]), r[1]))[:limit]
+
+
+def search_players(session, guild_id: int, query: str, limit: int = SEARCH_LIMIT) -> list[PlayerHit]:
+    """Jogadores (inclusive quem saiu do servidor) por nome, ordenados por relevância, um hit por user_id."""
+    q = " ".join((query or "").split())[:64]
+    # um user pode ter vários nomes no histórico: busca folgado e agrupa
+    fetch = limit * 4
+    if not has_fts(session):
+        rows = _fallback_rows(session, guild_id, q, fetch)
+    elif len(q) >= 3:
+        params = {"match": '"' + q.replace('"', '""') + '"', "prefix": _like_escape(q) + "%", "guild_id": guild_id, "limit": fetch}
+        rows = session.execute(_FTS_SQL, params).all()
+    else:
+        rows = session.execute(_PREFIX_SQL, {"prefix": _like_escape(q) + "%", "guild_id": guild_id, "limit": fetch}).all()
+
+    hits: dict[int, PlayerHit] = {}
+    for user_id, name in rows:
+        hit = hits.get(user_id)
+        if hit is None:
+            if len(hits) >= limit:
+                continue
+            hits[user_id] = PlayerHit(user_id=user_id, name=name)
+        elif name != hit.name and name not in hit.aliases:
+            hit.aliases.append(name)
+    return list(hits.values())
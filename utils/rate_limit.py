@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections import Counter
+
+import discord
+
+from config import CFG
+from utils.cache import LRUCache
+from utils.search_index import team_roles
+
+log = logging.getLogger(__name__)
+
+PRUNE_EVERY_SECONDS = 60
+
+SCOPE_LABELS = {
+    "command": "nesse comando",
+    "user": "seguidas",
+    "team": "do seu time",
+}
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket por chave: enche `per_minute` tokens por minuto até `burst`; cada tentativa gasta 1.
+    Os buckets ficam num LRU com TTL = tempo pra encher do zero: bucket parado esse tempo
+    estaria cheio de novo, então esquecer ele é igual a começar um novo.
+    """
+
+    def __init__(self, per_minute: float, burst: int, maxsize: int):
+        self.enabled = per_minute > 0 and burst > 0
+        self.rate = per_minute / 60 if self.enabled else 0.0
+        self.burst = burst
+        self._buckets = LRUCache(maxsize=maxsize, ttl=burst / self.rate if self.enabled else None)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _tokens(self, key, now: float) -> float:
+        item = self._buckets.get(key)
+        if item is None:
+            return float(self.burst)
+        tokens, updated = item
+        return min(float(self.burst), tokens + (now - updated) * self.rate)
+
+    def retry_after(self, key, now: float) -> float:
+        """0 se tem token; senão quantos segundos até ter (não gasta nada)."""
+        if not self.enabled:
+            return 0.0
+        tokens = self._tokens(key, now)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def consume(self, key, now: float) -> None:
+        if self.enabled:
+            # set() renova o TTL: o bucket só sai quando fica parado
+            self._buckets.set(key, (self._tokens(key, now) - 1, now))
+
+    def prune(self) -> int:
+        return self._buckets.prune()
+
+
+_limiters = {
+    "command": TokenBucketLimiter(CFG.RATE_COMMAND_PER_MINUTE, CFG.RATE_COMMAND_BURST, CFG.RATE_BUCKETS_MAX),
+    "user": TokenBucketLimiter(CFG.RATE_USER_PER_MINUTE, CFG.RATE_USER_BURST, CFG.RATE_BUCKETS_MAX),
+    "team": TokenBucketLimiter(CFG.RATE_TEAM_PER_MINUTE, CFG.RATE_TEAM_BURST, CFG.RATE_BUCKETS_MAX),
+}
+
+# (escopo, comando) -> tentativas recusadas desde o start
+rejected: Counter[tuple[str, str]] = Counter()
+_last_prune = time.monotonic()
+
+
+def _prune_idle(now: float) -> None:
+    global _last_prune
+    if now - _last_prune < PRUNE_EVERY_SECONDS:
+        return
+    _last_prune = now
+    for lim in _limiters.values():
+        lim.prune()
+
+
+def check(guild_id: int, user_id: int, team_id: int | None, command: str) -> tuple[float, str | None]:
+    """
+    Checa os três escopos e só gasta token se todos deixarem (recusa não gasta nada).
+    Retorna (0, None) se liberado, ou (segundos pra tentar de novo, escopo que barrou).
+    """
+    now = time.monotonic()
+    _prune_idle(now)
+    keys = [("command", (guild_id, user_id, command)), ("user", (guild_id, user_id))]
+    if team_id:
+        keys.append(("team", (guild_id, team_id)))
+
+    wait, scope = max((_limiters[s].retry_after(k, now), s) for s, k in keys)
+    if wait > 0:
+        rejected[(scope, command)] += 1
+        return wait, scope
+    for s, k in keys:
+        _limiters[s].consume(k, now)
+    return 0.0, None
+
+
+def member_team_id(member: discord.abc.User) -> int | None:
+    """Time do membro pelo cargo (índice em memória, sem DB)."""
+    if not isinstance(member, discord.Member):
+        return None
+    roles = team_roles(member.guild.id)
+    return next((team_id for role_id, team_id in roles.items() if member.get_role(role_id)), None)
+
+
+async def throttle(interaction: discord.Interaction, command: str) -> bool:
+    """
+    Chamar antes de qualquer DB/Roblox/Discord. True = barrado (já respondeu ephemeral),
+    quem chama só dá return.
+    """
+    user = interaction.user
+    wait, scope = check(interaction.guild_id or 0, user.id, member_team_id(user), command)
+    if not wait:
+        return False
+    log.debug("Rate limit: %s em %s (%s), retry %.1fs", user.id, command, scope, wait)
+    await interaction.response.send_message(
+        f"⏳ Muitas tentativas {SCOPE_LABELS[scope]}. Tenta de novo em {math.ceil(wait)}s.",
+        ephemeral=True,
+    )
+    return True
+
+
+def stats() -> dict:
+    """Buckets em memória por escopo + recusas por (escopo, comando)."""
+    return {
+        "buckets": {scope: len(lim) for scope, lim in _limiters.items()},
+        "rejected": dict(rejected),
+    }
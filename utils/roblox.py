@@ -44,4 +44,31 @@ async def roblox_headshot_url(user_id: int, size: str = "150x150") -> str | None
     arr = data.get("data") or []
     if not arr:
         return None
-    return arr[0].get("imageUrl")
\ No newline at end of file
+    return arr[0].get("imageUrl")
+
+async def usernames_to_user_ids(usernames: list[str]) -> dict[str, int]:
+    """Versão em lote do username_to_user_id (uma request por 100 nomes)."""
+    names = {(u or "").strip() for u in usernames}
+    names.discard("")
+    out = {u: _user_cache[u] for u in names if u in _user_cache}
+    missing = [u for u in names if u not in out]
+    if not missing:
+        return out
+
+    url = "https://users.roblox.com/v1/usernames/users"
+    async with aiohttp.ClientSession() as session:
+        for i in range(0, len(missing), 100):
+            chunk = missing[i:i + 100]
+            payload = {"usernames": chunk, "excludeBannedUsers": True}
+            async with session.post(url, json=payload, timeout=10) as resp:
+                if resp.status != 200:
+                    continue
+                data = await resp.json()
+
+            for item in data.get("data") or []:
+                requested = item.get("requestedUsername")
+                user_id = item.get("id")
+                if requested in chunk and isinstance(user_id, int):
+                    _user_cache[requested] = user_id
+                    out[requested] = user_id
+    return out
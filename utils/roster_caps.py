@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from sqlalchemy import func, update
+
+from db.models import Player, Team
+
+# role no time -> contador em teams (Captain/Player só entram no total)
+ROLE_COUNTERS = {
+    "Vice Captain": "vice_captain_count",
+    "Court Captain": "court_captain_count",
+}
+COUNTERS = ("player_count", "vice_captain_count", "court_captain_count")
+COUNTER_LABELS = {
+    "player_count": "jogadores",
+    "vice_captain_count": "Vice Captain",
+    "court_captain_count": "Court Captain",
+}
+
+
+def _caps(cfg) -> dict[str, int]:
+    return {
+        "player_count": cfg.roster_max_players,
+        "vice_captain_count": cfg.roster_max_vice_captains,
+        "court_captain_count": cfg.roster_max_court_captains,
+    }
+
+
+def roster_delta(old_team_id: int | None, old_role: str | None, new_team_id: int | None, new_role: str | None) -> dict[int, dict[str, int]]:
+    """team_id -> {contador: +n/-n} de uma movimentação (sai do time antigo, entra no novo)."""
+    out: dict[int, dict[str, int]] = {}
+
+    def bump(team_id: int | None, role: str | None, n: int) -> None:
+        if not team_id:
+            return
+        d = out.setdefault(team_id, {})
+        d["player_count"] = d.get("player_count", 0) + n
+        col = ROLE_COUNTERS.get(role or "")
+        if col:
+            d[col] = d.get(col, 0) + n
+
+    bump(old_team_id, old_role, -1)
+    bump(new_team_id, new_role, 1)
+    return {tid: {c: n for c, n in d.items() if n} for tid, d in out.items() if any(d.values())}
+
+
+def cap_violation(
+    team: Team,
+    cfg,
+    old_team_id: int | None,
+    old_role: str | None,
+    new_role: str | None,
+    reserved: dict[str, int] | None = None,
+) -> str | None:
+    """
+    Checa os limites do time de destino só pelos contadores (sem COUNT).
+    `reserved`: vagas já usadas por outras linhas do mesmo lote.
+    Retorna a mensagem de erro ou None se cabe.
+    """
+    delta = roster_delta(old_team_id, old_role, team.id, new_role).get(team.id, {})
+    reserved = reserved or {}
+    for col, cap in _caps(cfg).items():
+        n = delta.get(col, 0)
+        if cap and n > 0 and getattr(team, col) + reserved.get(col, 0) + n > cap:
+            return f"**{team.name}** já tem o máximo de {cap} {COUNTER_LABELS[col]}."
+    return None
+
+
+def move_player(session, player: Player, team_id: int | None, role: str | None) -> None:
+    """
+    Muda time/role do jogador e ajusta os contadores dos dois times
+    na mesma transação (o commit fica com quem chama).
+    """
+    for tid, delta in roster_delta(player.team_id, player.team_role, team_id, role).items():
+        session.execute(
+            update(Team)
+            .where(Team.id == tid)
+            .values({getattr(Team, c): getattr(Team, c) + n for c, n in delta.items()})
+        )
+    player.team_id = team_id
+    player.team_role = role if team_id else None
+
+
+def recount_teams(session, guild_id: int) -> int:
+    """Reparo: recalcula os contadores do guild a partir de players (um GROUP BY). Retorna quantos times mudaram."""
+    counts: dict[int, dict[str, int]] = {}
+    rows = (
+        session.query(Player.team_id, Player.team_role, func.count())
+        .filter(Player.guild_id == guild_id, Player.team_id.isnot(None))
+        .group_by(Player.team_id, Player.team_role)
+        .all()
+    )
+    for team_id, role, n in rows:
+        d = counts.setdefault(team_id, {})
+        d["player_count"] = d.get("player_count", 0) + n
+        col = ROLE_COUNTERS.get(role or "")
+        if col:
+            d[col] = d.get(col, 0) + n
+
+    changed = 0
+    for team in session.query(Team).filter(Team.guild_id == guild_id).all():
+        fresh = counts.get(team.id, {})
+        if any(getattr(team, c) != fresh.get(c, 0) for c in COUNTERS):
+            for c in COUNTERS:
+                setattr(team, c, fresh.get(c, 0))
+            changed += 1
+    session.commit()
+    return changed
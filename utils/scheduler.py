@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Hashable
+
+log = logging.getLogger(__name__)
+
+JobCallback = Callable[[], Awaitable[None]]
+
+
+class Scheduler:
+    """
+    Agenda jobs por horário (UTC naive, igual ao resto do DB) com UMA task só.
+
+    Os jobs ficam num heap (when, seq, key). Cancelar/reagendar não mexe no heap:
+    a entrada antiga vira "stale" (seq não bate mais) e é descartada quando sai.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int, Hashable]] = []
+        self._jobs: dict[Hashable, tuple[int, JobCallback]] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._wait_until: Callable[[], Awaitable[None]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._jobs
+
+    def schedule(self, when: datetime, key: Hashable, callback: JobCallback) -> None:
+        """Agenda (ou reagenda) o job `key` para `when`."""
+        seq = next(self._seq)
+        self._jobs[key] = (seq, callback)
+        heapq.heappush(self._heap, (when, seq, key))
+
+        # só acorda o loop se esse job passou a ser o próximo
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        removed = self._jobs.pop(key, None) is not None
+        # heap com muito lixo -> reconstrói (mantém memória proporcional aos jobs vivos)
+        if removed and len(self._heap) > 64 and len(self._heap) > 2 * len(self._jobs):
+            self._compact()
+        return removed
+
+    def clear(self) -> None:
+        self._jobs.clear()
+        self._heap.clear()
+        self._wakeup.set()
+
+    def start(self, wait_until: Callable[[], Awaitable[None]] | None = None) -> None:
+        """`wait_until`: aguardado antes do primeiro job (ex: bot.wait_until_ready)."""
+        if wait_until is not None:
+            self._wait_until = wait_until
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="league-scheduler")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _compact(self) -> None:
+        self._heap = [e for e in self._heap if self._is_live(e)]
+        heapq.heapify(self._heap)
+
+    def _is_live(self, entry: tuple[datetime, int, Hashable]) -> bool:
+        job = self._jobs.get(entry[2])
+        return job is not None and job[0] == entry[1]
+
+    async def _run(self) -> None:
+        if self._wait_until is not None:
+            await self._wait_until()
+        while True:
+            # descarta entradas canceladas/reagendadas do topo
+            while self._heap and not self._is_live(self._heap[0]):
+                heapq.heappop(self._heap)
+
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            when, seq, key = self._heap[0]
+            delay = (when - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            _, callback = self._jobs.pop(key)
+            try:
+                await callback()
+            except Exception:
+                log.exception("Job agendado %r falhou", key)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+
+
+def _fold(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(folded: str) -> set[str]:
+    return {folded[i:i + 3] for i in range(len(folded) - 2)}
+
+
+class NameIndex:
+    """
+    Índice em memória pra autocomplete: prefixo via bisect numa lista ordenada
+    e, se faltar resultado, substring via trigramas (query com 3+ letras).
+    """
+
+    def __init__(self):
+        self._sorted: list[tuple[str, str]] = []  # (folded, valor original)
+        self._folded: dict[str, str] = {}  # valor -> folded
+        self._trigram_map: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._folded)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._folded
+
+    def add(self, value: str) -> None:
+        if value in self._folded:
+            return
+        folded = _fold(value)
+        self._folded[value] = folded
+        insort(self._sorted, (folded, value))
+        for tri in _trigrams(folded):
+            self._trigram_map.setdefault(tri, set()).add(value)
+
+    def remove(self, value: str) -> None:
+        folded = self._folded.pop(value, None)
+        if folded is None:
+            return
+        i = bisect_left(self._sorted, (folded, value))
+        if i < len(self._sorted) and self._sorted[i] == (folded, value):
+            del self._sorted[i]
+        for tri in _trigrams(folded):
+            bucket = self._trigram_map.get(tri)
+            if bucket is not None:
+                bucket.discard(value)
+                if not bucket:
+                    del self._trigram_map[tri]
+
+    def clear(self) -> None:
+        self._sorted.clear()
+        self._folded.clear()
+        self._trigram_map.clear()
+
+    def search(self, query: str, limit: int = 25) -> list[str]:
+        q = _fold(query or "")
+        if not q:
+            return [v for _, v in self._sorted[:limit]]
+
+        out: list[str] = []
+        i = bisect_left(self._sorted, (q, ""))
+        while i < len(self._sorted) and len(out) < limit:
+            folded, value = self._sorted[i]
+            if not folded.startswith(q):
+                break
+            out.append(value)
+            i += 1
+
+        if len(out) >= limit or len(q) < 3:
+            return out
+
+        # substring: candidatos = interseção dos trigramas da query
+        buckets = sorted((self._trigram_map.get(t, set()) for t in _trigrams(q)), key=len)
+        candidates = set(buckets[0]).intersection(*buckets[1:]) if buckets else set()
+        seen = set(out)
+        extra = [
+            v for v in candidates
+            if v not in seen and q in self._folded[v]
+        ]
+        extra.sort(key=lambda v: (self._folded[v].find(q), self._folded[v]))
+        out.extend(extra[:limit - len(out)])
+        return out
+
+
+# Nomes dos times cadastrados (Team.name), por guild
+_team_names: dict[int, NameIndex] = {}
+
+# match_id dos matches sem resultado (OPEN/CLOSED), por guild
+_pending_matches: dict[int, NameIndex] = {}
+
+# cargo do time -> Team.id, por guild (achar o time de um membro sem ir no DB)
+_team_roles: dict[int, dict[int, int]] = {}
+
+
+def _per_guild(registry: dict[int, NameIndex], guild_id: int) -> NameIndex:
+    idx = registry.get(guild_id)
+    if idx is None:
+        idx = registry[guild_id] = NameIndex()
+    return idx
+
+
+def team_names(guild_id: int) -> NameIndex:
+    return _per_guild(_team_names, guild_id)
+
+
+def pending_matches(guild_id: int) -> NameIndex:
+    return _per_guild(_pending_matches, guild_id)
+
+
+def team_roles(guild_id: int) -> dict[int, int]:
+    roles = _team_roles.get(guild_id)
+    if roles is None:
+        roles = _team_roles[guild_id] = {}
+    return roles
+
+
+def hydrate_indexes(session) -> None:
+    """
+    Carrega os índices do DB (startup / depois de import ou restore).
+    Monta tudo em dicts novos e só troca no final: pode rodar numa thread
+    (warm-up do ready-fast) enquanto o autocomplete lê os índices antigos.
+    """
+    from db.models import Team, MatchSchedule
+
+    teams: dict[int, NameIndex] = {}
+    roles: dict[int, dict[int, int]] = {}
+    for team_id, guild_id, name, role_id in session.query(Team.id, Team.guild_id, Team.name, Team.role_id).all():
+        _per_guild(teams, guild_id).add(name)
+        roles.setdefault(guild_id, {})[role_id] = team_id
+
+    matches: dict[int, NameIndex] = {}
+    rows = session.query(MatchSchedule.guild_id, MatchSchedule.match_id).filter(MatchSchedule.status != "DONE").all()
+    for guild_id, match_id in rows:
+        _per_guild(matches, guild_id).add(match_id)
+
+    _team_names.clear()
+    _team_names.update(teams)
+    _team_roles.clear()
+    _team_roles.update(roles)
+    _pending_matches.clear()
+    _pending_matches.update(matches)
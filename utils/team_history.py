@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import case, func, tuple_
+
+from db.models import Team, TeamResult
+
+HISTORY_PAGE_SIZE = 15
+
+
+@dataclass(frozen=True)
+class H2HRecord:
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    points_for: int = 0
+    points_against: int = 0
+
+    @property
+    def played(self) -> int:
+        return self.wins + self.losses + self.draws
+
+
+def resolve_team_ids(session, guild_id: int, *names: str) -> dict[str, int]:
+    """nome digitado (case-insensitive) -> Team.id, só os que existem."""
+    folded = {n.lower() for n in names if n}
+    if not folded:
+        return {}
+    rows = session.query(Team.name, Team.id).filter(Team.guild_id == guild_id, func.lower(Team.name).in_(folded)).all()
+    by_lower = {name.lower(): tid for name, tid in rows}
+    return {n: by_lower[n.lower()] for n in names if n and n.lower() in by_lower}
+
+
+def record_results(
+    session,
+    guild_id: int,
+    results: list[tuple[str, str, str, int, int]],
+    played_at: datetime | None = None,
+) -> int:
+    """
+    Indexa resultados (match_id, team_a, team_b, score_a, score_b): 2 rows por match,
+    uma por lado, na mesma transação do MatchResult (o commit fica com quem chama).
+    Uma query pros times e um DELETE pro lote todo; re-post do mesmo match substitui o anterior.
+    Match com time não cadastrado fica fora do histórico. Retorna quantos foram indexados.
+    """
+    ids = resolve_team_ids(session, guild_id, *{name for r in results for name in r[1:3]})
+    played_at = played_at or datetime.utcnow()
+
+    rows: list[TeamResult] = []
+    indexed: list[str] = []
+    for match_id, team_a, team_b, score_a, score_b in results:
+        a_id, b_id = ids.get(team_a), ids.get(team_b)
+        if not a_id or not b_id or a_id == b_id:
+            continue
+        indexed.append(match_id)
+        rows += [
+            TeamResult(guild_id=guild_id, team_id=a_id, opponent_id=b_id, match_id=match_id,
+                       points_for=score_a, points_against=score_b, played_at=played_at),
+            TeamResult(guild_id=guild_id, team_id=b_id, opponent_id=a_id, match_id=match_id,
+                       points_for=score_b, points_against=score_a, played_at=played_at),
+        ]
+    if not rows:
+        return 0
+
+    session.query(TeamResult).filter(
+        TeamResult.guild_id == guild_id,
+        TeamResult.match_id.in_(indexed),
+    ).delete(synchronize_session=False)
+    session.add_all(rows)
+    return len(indexed)
+
+
+def record_result(
+    session,
+    guild_id: int,
+    match_id: str,
+    team_a: str,
+    team_b: str,
+    score_a: int,
+    score_b: int,
+    played_at: datetime | None = None,
+) -> bool:
+    """Um resultado só (/result_post). False se algum time não é um Team cadastrado."""
+    return record_results(session, guild_id, [(match_id, team_a, team_b, score_a, score_b)], played_at) == 1
+
+
+def history_page(
+    session,
+    team_id: int,
+    cursor: tuple[datetime, int] | None,
+    opponent_id: int | None = None,
+    page_size: int = HISTORY_PAGE_SIZE,
+) -> tuple[list[TeamResult], tuple[datetime, int] | None]:
+    """Página (mais recente primeiro) por keyset em (played_at, id); com opponent_id usa o índice do h2h."""
+    q = session.query(TeamResult).filter(TeamResult.team_id == team_id)
+    if opponent_id is not None:
+        q = q.filter(TeamResult.opponent_id == opponent_id)
+    if cursor:
+        q = q.filter(tuple_(TeamResult.played_at, TeamResult.id) < tuple_(*cursor))
+    rows = q.order_by(TeamResult.played_at.desc(), TeamResult.id.desc()).limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = (rows[-1].played_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def h2h_record(session, team_id: int, opponent_id: int) -> H2HRecord:
+    """Retrospecto do ponto de vista de team_id (um range no ix_team_result_h2h)."""
+    pf, pa = TeamResult.points_for, TeamResult.points_against
+    row = (
+        session.query(
+            func.coalesce(func.sum(case((pf > pa, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((pf < pa, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((pf == pa, 1), else_=0)), 0),
+            func.coalesce(func.sum(pf), 0),
+            func.coalesce(func.sum(pa), 0),
+        )
+        .filter(TeamResult.team_id == team_id, TeamResult.opponent_id == opponent_id)
+        .one()
+    )
+    return H2HRecord(*row)
+
+
+def outcome(r: TeamResult) -> str:
+    if r.points_for > r.points_against:
+        return "W"
+    if r.points_for < r.points_against:
+        return "L"
+    return "D"